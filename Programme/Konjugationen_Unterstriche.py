@@ -1,10 +1,12 @@
-from docx import Document
-from docx.shared import Pt, Cm
-from docx.enum.text import WD_ALIGN_PARAGRAPH
-from docx.oxml import OxmlElement
-from docx.oxml.ns import qn
-from io import BytesIO
 import random
+import zipfile
+from io import BytesIO
+
+from docx.shared import Cm
+
+from Programme.dokument import FESTE_ZEIT, neues_dokument
+from Programme.konjugationen import KonjugationsTabelle
+from Programme.tabellen import Zellformat
 
 
 def run_Unterstriche_Konjugationen(
@@ -12,65 +14,89 @@ def run_Unterstriche_Konjugationen(
     num_rows,
     selected_time_1,
     selected_time_2,
-    template_path
+    template_path,
+    verben=None,
+    backend="docx",
+    seed=None,
+    anzahl=1
 ):
-    dokument = Document(template_path)
+    """
+    words_data: KonjugationsTabelle (einmal pro Prozess geladen) oder
+                {Infinitiv: {Zeitform: {Person: Form}}}
+    verben:     Auswahl an Infinitiven (Standard: alle)
+    backend:    "docx" oder "stream" (siehe Programme/dokument.py)
+    seed:       gleiche Auswahl + gleicher Seed ergeben dasselbe Dokument (Varianten)
+    anzahl:     so viele verschiedene Tests hintereinander (z.B. einer pro Schüler),
+                Verben und Personen gleichmäßig verteilt (KonjugationsTabelle.ziehe_tests)
+    """
+    tabelle = _als_tabelle(words_data)
+    tests = tabelle.ziehe_tests(anzahl, num_rows, verben, rng=random.Random(seed))
+
+    dokument = neues_dokument(template_path, backend)
+    for nr, test in enumerate(tests, 1):
+        if nr > 1:
+            dokument.seitenumbruch()
+        _schreibe_test(
+            dokument, tabelle, test, selected_time_1, selected_time_2, nr if anzahl > 1 else None
+        )
+    return dokument.speichern()
+
+
+def konjugationstests_zip(
+    words_data,
+    num_rows,
+    selected_time_1,
+    selected_time_2,
+    template_path,
+    anzahl,
+    verben=None,
+    backend="stream",
+    seed=None
+):
+    """Wie run_Unterstriche_Konjugationen, aber jeder Test als eigene .docx in einer ZIP-Datei."""
+    tabelle = _als_tabelle(words_data)
+    tests = tabelle.ziehe_tests(anzahl, num_rows, verben, rng=random.Random(seed))
+
+    ziel = BytesIO()
+    with zipfile.ZipFile(ziel, "w", zipfile.ZIP_STORED) as zf:
+        for nr, test in enumerate(tests, 1):
+            dokument = neues_dokument(template_path, backend)
+            _schreibe_test(dokument, tabelle, test, selected_time_1, selected_time_2, nr)
+            info = zipfile.ZipInfo(f"Konjugationstest_{nr:03d}.docx", FESTE_ZEIT)
+            info.create_system = 0
+            zf.writestr(info, dokument.speichern().getvalue())
+    ziel.seek(0)
+    return ziel
+
+
+def _als_tabelle(words_data):
+    if isinstance(words_data, KonjugationsTabelle):
+        return words_data
+    return KonjugationsTabelle.from_dict(words_data)
+
+
+def _schreibe_test(dokument, tabelle, test, selected_time_1, selected_time_2, nummer=None):
+    """Die drei Seiten eines Tests (Unterstriche, erster Buchstabe, nur Pronomen)."""
+    titel = 'Test de conjugaison' if nummer is None else f'Test de conjugaison n° {nummer}'
 
     # =========================
     # Überschrift Seite 1
     # =========================
-    ueberschrift = dokument.add_heading('Test de conjugaison', level=0)
-    run = ueberschrift.runs[0]
-    run.bold = True
-    run.font.size = Pt(18)
-    run.font.name = 'Arial'
-    ueberschrift.alignment = WD_ALIGN_PARAGRAPH.CENTER
-    dokument.add_paragraph('')
+    dokument.ueberschrift(
+        titel,
+        level=0,
+        fmt=Zellformat(fett=True, groesse=18, schrift='Arial', ausrichtung="center")
+    )
+    dokument.absatz('')
 
     # =========================
     # Hilfsfunktionen
     # =========================
-    def set_zeilenhoehe(row, height_cm):
-        tr = row._tr
-        trPr = tr.get_or_add_trPr()
-        trHeight = OxmlElement('w:trHeight')
-        trHeight.set(qn('w:val'), str(int(height_cm * 567)))
-        trHeight.set(qn('w:hRule'), 'atLeast')
-        trPr.append(trHeight)
-
-    def set_spaltenbreiten(table, widths):
-        table.autofit = False
-        for row in table.rows:
-            for i, width in enumerate(widths):
-                row.cells[i].width = width
-
-    # ---------- nur Unterstriche ----------
-    def underline_form(form):
-        parts = form.split()
-        return "   ".join("_ " * len(part) for part in parts).strip()
-
-    # ---------- erster Buchstabe + Unterstriche ----------
-    def underline_first_buchstabe(form):
-        parts = form.split()
-        result = []
-        for part in parts:
-            if part:
-                result.append(part[0] + " " + "_ " * (len(part) - 1))
-        return "   ".join(p.strip() for p in result)
-
     # ---------- französische Elision (immer nach Originalform!) ----------
-    def apply_french_elision(pronoun, display_text, original_form):
-        vowels = (
-            "a", "e", "i", "o", "u", "h",
-            "â", "ê", "î", "ô", "û",
-            "é", "è", "ë", "ï"
-        )
-
-        first_real_char = original_form.strip().lower()[:1]
-
-        if pronoun == "je" and first_real_char in vowels:
+    # Masken und Elision sind beim Laden der Tabelle vorberechnet
+    def mit_pronomen(pronoun, display_text, form_id):
+        if pronoun == "je" and tabelle.elision[form_id]:
             return "j’" + display_text
-
         return f"{pronoun} {display_text}"
 
     # =========================
@@ -83,85 +109,51 @@ def run_Unterstriche_Konjugationen(
         - pronoun       → nur Pronomen
         - first_letter  → erster Buchstabe + Unterstriche
         """
-        table = dokument.add_table(rows=1, cols=4)
-        table.style = 'Tabellenraster'
-        table.autofit = False
-
-        headers = ["Verbe", selected_time_1, selected_time_2, "En allemand"]
-        for i, h in enumerate(headers):
-            cell = table.rows[0].cells[i]
-            cell.text = h
-            para = cell.paragraphs[0]
-            para.alignment = WD_ALIGN_PARAGRAPH.CENTER
-            run = para.runs[0]
-            run.bold = True
-            run.font.size = Pt(12)
-
+        zeilen = []
         for entry in exercises:
-            row = table.add_row().cells
-            row[0].text = entry["verb"]
-
             if mode == "underline":
-                row[1].text = apply_french_elision(
-                    entry["p1"],
-                    underline_form(entry["f1"]),
-                    entry["f1"]
-                )
-                row[2].text = apply_french_elision(
-                    entry["p2"],
-                    underline_form(entry["f2"]),
-                    entry["f2"]
-                )
+                f1 = mit_pronomen(entry["p1"], tabelle.masken[entry["f1"]], entry["f1"])
+                f2 = mit_pronomen(entry["p2"], tabelle.masken[entry["f2"]], entry["f2"])
 
             elif mode == "pronoun":
                 # Elision auch hier korrekt anzeigen
-                row[1].text = "j’" if entry["p1"] == "je" and entry["f1"][0].lower() in "aeiouh" else entry["p1"]
-                row[2].text = "j’" if entry["p2"] == "je" and entry["f2"][0].lower() in "aeiouh" else entry["p2"]
+                f1 = "j’" if entry["p1"] == "je" and tabelle.elision[entry["f1"]] else entry["p1"]
+                f2 = "j’" if entry["p2"] == "je" and tabelle.elision[entry["f2"]] else entry["p2"]
 
             elif mode == "first_letter":
-                row[1].text = apply_french_elision(
-                    entry["p1"],
-                    underline_first_buchstabe(entry["f1"]),
-                    entry["f1"]
-                )
-                row[2].text = apply_french_elision(
-                    entry["p2"],
-                    underline_first_buchstabe(entry["f2"]),
-                    entry["f2"]
-                )
-
-            row[3].text = ""
-
-        widths = [Cm(3), Cm(5.522), Cm(5.522), Cm(4)]
-        set_spaltenbreiten(table, widths)
-
-        for r in table.rows:
-            set_zeilenhoehe(r, 1)
+                f1 = mit_pronomen(entry["p1"], tabelle.erste_buchstaben[entry["f1"]], entry["f1"])
+                f2 = mit_pronomen(entry["p2"], tabelle.erste_buchstaben[entry["f2"]], entry["f2"])
+
+            zeilen.append((entry["verb"], f1, f2, ""))
+
+        dokument.tabelle(
+            zeilen,
+            kopfzeile=["Verbe", selected_time_1, selected_time_2, "En allemand"],
+            style='Tabellenraster',
+            breiten=[Cm(3), Cm(5.522), Cm(5.522), Cm(4)],
+            zeilenhoehe_cm=1,
+            kopf_format=Zellformat(fett=True, groesse=12, ausrichtung="center")
+        )
 
     # =========================
     # Aufgaben EINMAL erzeugen
     # =========================
-    personalpronomen = ["je", "tu", "il", "elle", "on", "nous", "vous", "ils", "elles"]
-    infinitives = list(words_data.keys())
-
-    exercises = []
-
-    for _ in range(num_rows):
-        verb = random.choice(infinitives)
+    verb_ids, p1_ids, p2_ids = test
 
-        p1 = random.choice(personalpronomen)
-        f1 = words_data[verb].get(selected_time_1, {}).get(p1, verb)
+    # Nummern der Formen (Index in tabelle.masken, tabelle.elision, …)
+    f1_list = tabelle.form_ids(verb_ids, tabelle.tense_ids.get(selected_time_1), p1_ids)
+    f2_list = tabelle.form_ids(verb_ids, tabelle.tense_ids.get(selected_time_2), p2_ids)
 
-        p2 = random.choice(personalpronomen)
-        f2 = words_data[verb].get(selected_time_2, {}).get(p2, verb)
-
-        exercises.append({
-            "verb": verb,
-            "p1": p1,
+    exercises = [
+        {
+            "verb": tabelle.verbs[v],
+            "p1": tabelle.persons[p1],
             "f1": f1,
-            "p2": p2,
+            "p2": tabelle.persons[p2],
             "f2": f2
-        })
+        }
+        for v, p1, f1, p2, f2 in zip(verb_ids, p1_ids, f1_list, p2_ids, f2_list)
+    ]
 
     # =========================
     # Seite 1: Unterstriche
@@ -171,24 +163,18 @@ def run_Unterstriche_Konjugationen(
     # =========================
     # Seite 2: nur Pronomen
     # =========================
-    dokument.add_page_break()
-    u3 = dokument.add_heading('Test de conjugaison – première lettre', level=0)
-    u3.alignment = WD_ALIGN_PARAGRAPH.CENTER
+    dokument.seitenumbruch()
+    dokument.ueberschrift(
+        titel + ' – première lettre',
+        level=0,
+        fmt=Zellformat(ausrichtung="center")
+    )
     create_table(mode="first_letter")
 
     # =========================
     # Seite 3: erster Buchstabe
     # =========================
-    dokument.add_page_break()
-    u2 = dokument.add_heading('Test de conjugaison', level=0)
-    u2.alignment = WD_ALIGN_PARAGRAPH.CENTER
+    dokument.seitenumbruch()
+    dokument.ueberschrift(titel, level=0, fmt=Zellformat(ausrichtung="center"))
     create_table(mode="pronoun")
 
-    # =========================
-    # Dokument zurückgeben
-    # =========================
-    word_stream = BytesIO()
-    dokument.save(word_stream)
-    word_stream.seek(0)
-    return word_stream
-
@@ -1,36 +1,50 @@
 import random
 import os
-from docx import Document
-from docx.shared import Pt
-from io import BytesIO
-from docx.oxml import OxmlElement
-from docx.oxml.ns import qn
+
+from Programme.dokument import speichere
+from Programme.tabellen import Zellformat, baue_tabelle
+from Programme.vorlagen import lade_vorlage
+
+
+# ----------------------------
+# Buchstaben mischen
+# ----------------------------
+def mischbar(wort, fest=0):
+    """True, wenn es eine andere Reihenfolge gibt (mind. zwei verschiedene Buchstaben hinter fest)."""
+    return len(set(wort.replace(" ", "")[fest:])) > 1
+
+def buchstaben_mischen(wort, rng=random, fest=0):
+    """
+    Buchstaben ohne Leerzeichen in neuer Reihenfolge, die ersten fest
+    Buchstaben bleiben stehen. Das Ergebnis unterscheidet sich immer vom
+    Wort, wenn das möglich ist (mischbar()); sonst bleibt es, wie es ist
+    (z.B. "aa"). Statt so lange neu zu mischen, bis es anders aussieht,
+    werden bei einem Treffer zwei verschiedene Buchstaben getauscht.
+    """
+    wort = wort.replace(" ", "")
+    if not mischbar(wort, fest):
+        return wort
+
+    rest = list(wort[fest:])
+    rng.shuffle(rest)
+    if ''.join(rest) == wort[fest:]:
+        i = rng.randrange(len(rest))
+        j = rng.choice([k for k, b in enumerate(rest) if b != rest[i]])
+        rest[i], rest[j] = rest[j], rest[i]
+    return wort[:fest] + ''.join(rest)
+
+def mische_alle(woerter, rng=random, fest=0):
+    """buchstaben_mischen() für eine ganze Wortliste, in derselben Reihenfolge."""
+    return [buchstaben_mischen(wort, rng, fest) for wort in woerter]
 
 
 def run_Rätsel(words_with_translations, template_path=None, font_size=12,
-               heading="mystère", instructions="1. Cherche les mots", max_words=None):
-
-    def buchstaben_mischen(wort):
-        if len(wort) <= 1:
-            return wort
-        buchstaben = list(wort.replace(" ", ""))
-        shuffled = wort
-        while shuffled == wort:
-            random.shuffle(buchstaben)
-            shuffled = ''.join(buchstaben)
-        return shuffled
-
-    def buchstaben_mit_ersten(wort):
-        wort_clean = wort.replace(" ", "")
-        if len(wort_clean) <= 1:
-            return wort_clean
-        erster = wort_clean[0]
-        rest = list(wort_clean[1:])
-        random.shuffle(rest)
-        return erster + ''.join(rest)
+               heading="mystère", instructions="1. Cherche les mots", max_words=None, seed=None):
+    """seed: gleiche Wörter + gleicher Seed ergeben dasselbe Dokument (Varianten)"""
+    rng = random.Random(seed)
 
     # Dokument laden oder neu erstellen
-    doc = Document(template_path)
+    doc = lade_vorlage(template_path)
 
     # -------------------------
     # SEITE 1 – normales Rätsel
@@ -38,37 +52,23 @@ def run_Rätsel(words_with_translations, template_path=None, font_size=12,
     doc.add_heading(heading, level=1)
     doc.add_paragraph(instructions)
 
-    random.shuffle(words_with_translations)
-
-    table = doc.add_table(rows=1, cols=3)
-    table.style = 'Table Grid'
-
-    def set_row_height(row, height_cm):
-        tr = row._tr
-        trPr = tr.get_or_add_trPr()
-        trHeight = OxmlElement('w:trHeight')
-        trHeight.set(qn('w:val'), str(int(height_cm * 567)))
-        trHeight.set(qn('w:hRule'), 'atLeast')
-        trPr.append(trHeight)
+    # Kopie mischen, die Liste des Aufrufers bleibt unverändert
+    words_with_translations = list(words_with_translations)
+    rng.shuffle(words_with_translations)
+    words = [word for word, translation in words_with_translations]
 
     headers = ["mystère", "mot", "traduction"]
-    for col_idx, text in enumerate(headers):
-        cell = table.cell(0, col_idx)
-        cell.text = ""
-        run = cell.paragraphs[0].add_run(text)
-        run.bold = True
-    set_row_height(table.rows[0], 1.2)
-
-    for word, translation in words_with_translations:
-        row = table.add_row()
-        set_row_height(row, 1.2)
-        row_cells = row.cells
-
-        run0 = row_cells[0].paragraphs[0].add_run(buchstaben_mischen(word))
-        run0.font.size = Pt(font_size)
-
-        row_cells[1].paragraphs[0].add_run("").font.size = Pt(font_size)
-        row_cells[2].paragraphs[0].add_run("").font.size = Pt(font_size)
+    kopf_format = Zellformat(fett=True)
+    zellen_format = Zellformat(groesse=font_size)
+
+    baue_tabelle(
+        doc,
+        [(gemischt, "", "") for gemischt in mische_alle(words, rng)],
+        kopfzeile=headers,
+        zeilenhoehe_cm=1.2,
+        kopf_format=kopf_format,
+        zellen_format=zellen_format
+    )
 
     # -------------------------
     # SEITE 2 – erster Buchstabe + gemischter Rest
@@ -77,29 +77,14 @@ def run_Rätsel(words_with_translations, template_path=None, font_size=12,
     doc.add_heading(heading + " – aide", level=1)
     doc.add_paragraph("1. Trouve les mots (première lettre donnée)")
 
-    table2 = doc.add_table(rows=1, cols=3)
-    table2.style = 'Table Grid'
-
-    for col_idx, text in enumerate(headers):
-        cell = table2.cell(0, col_idx)
-        cell.text = ""
-        run = cell.paragraphs[0].add_run(text)
-        run.bold = True
-    set_row_height(table2.rows[0], 1.2)
-
-    for word, translation in words_with_translations:
-        row = table2.add_row()
-        set_row_height(row, 1.2)
-        row_cells = row.cells
-
-        run0 = row_cells[0].paragraphs[0].add_run(buchstaben_mit_ersten(word))
-        run0.font.size = Pt(font_size)
-
-        row_cells[1].paragraphs[0].add_run("").font.size = Pt(font_size)
-        row_cells[2].paragraphs[0].add_run("").font.size = Pt(font_size)
+    baue_tabelle(
+        doc,
+        [(gemischt, "", "") for gemischt in mische_alle(words, rng, fest=1)],
+        kopfzeile=headers,
+        zeilenhoehe_cm=1.2,
+        kopf_format=kopf_format,
+        zellen_format=zellen_format
+    )
 
     # Dokument zurückgeben
-    word_stream = BytesIO()
-    doc.save(word_stream)
-    word_stream.seek(0)
-    return word_stream
+    return speichere(doc)
@@ -1,70 +1,40 @@
 import random
-from docx import Document
-from docx.shared import Pt
-from docx.oxml.ns import qn
-from docx.enum.text import WD_PARAGRAPH_ALIGNMENT
-from docx.enum.table import WD_TABLE_ALIGNMENT
-from docx.oxml import OxmlElement
-from io import BytesIO
 
-def run_Wortschlange(words_with_translations, template_path=None, font_size=14):
-    doc = Document(template_path)
+from Programme.dokument import speichere
+from Programme.sprache import wortform
+from Programme.tabellen import Zellformat, baue_tabelle
+from Programme.vorlagen import lade_vorlage
 
-    def set_row_height(row, height_cm):
-        tr = row._tr
-        trPr = tr.get_or_add_trPr()
-        trHeight = OxmlElement('w:trHeight')
-        trHeight.set(qn('w:val'), str(int(height_cm * 567)))
-        trHeight.set(qn('w:hRule'), 'atLeast')
-        trPr.append(trHeight)
+def run_Wortschlange(words_with_translations, template_path=None, font_size=14, seed=None):
+    """seed: gleiche Wörter + gleicher Seed ergeben dasselbe Dokument (Varianten)"""
+    rng = random.Random(seed)
+    doc = lade_vorlage(template_path)
+
+    kopf_format = Zellformat(fett=True, groesse=font_size, schrift='Arial', ausrichtung="left")
+    zellen_format = Zellformat(groesse=font_size, schrift='Arial')
 
     def add_wortschlange_table(text):
-        table = doc.add_table(rows=1, cols=1)
-        table.style = 'Table Grid'
-        table.alignment = WD_TABLE_ALIGNMENT.CENTER
-        cell = table.rows[0].cells[0]
-        paragraph = cell.paragraphs[0]
-        run = paragraph.add_run(text)
-        run.font.name = 'Arial'
-        run._element.rPr.rFonts.set(qn('w:eastAsia'), 'Arial')
-        run.font.size = Pt(font_size)
-        paragraph.alignment = WD_PARAGRAPH_ALIGNMENT.LEFT
+        table = baue_tabelle(
+            doc,
+            [(text,)],
+            spalten=1,
+            ausrichtung="center",
+            zellen_format=Zellformat(groesse=font_size, schrift='Arial', ausrichtung="left")
+        )
         doc.add_paragraph("\n")
         return table
 
     def add_schueler_tabelle():
-        table = doc.add_table(rows=1, cols=2)
-        table.style = 'Table Grid'
-        table.alignment = WD_TABLE_ALIGNMENT.CENTER
-        headers = ["mot", "traduction"]
-        for col_idx, text in enumerate(headers):
-            cell = table.cell(0, col_idx)
-            paragraph = cell.paragraphs[0]
-            paragraph.alignment = WD_PARAGRAPH_ALIGNMENT.LEFT
-            run = paragraph.add_run(text)
-            run.bold = True
-            run.font.name = 'Arial'
-            run._element.rPr.rFonts.set(qn('w:eastAsia'), 'Arial')
-            run.font.size = Pt(font_size)
-        set_row_height(table.rows[0], 1.2)
-
         # Zeilen für jede Aufgabe
-        for word, translation in words_with_translations:
-            row = table.add_row()
-            set_row_height(row, 1.2)
-            row_cells = row.cells
-            # Wort
-            p1 = row_cells[0].paragraphs[0]
-            run1 = p1.add_run('')
-            run1.font.name = 'Arial'
-            run1._element.rPr.rFonts.set(qn('w:eastAsia'), 'Arial')
-            run1.font.size = Pt(font_size)
-            # Übersetzung
-            p2 = row_cells[1].paragraphs[0]
-            run2 = p2.add_run('')
-            run2.font.name = 'Arial'
-            run2._element.rPr.rFonts.set(qn('w:eastAsia'), 'Arial')
-            run2.font.size = Pt(font_size)
+        table = baue_tabelle(
+            doc,
+            [("", "") for _ in words_with_translations],
+            kopfzeile=["mot", "traduction"],
+            zeilenhoehe_cm=1.2,
+            ausrichtung="center",
+            kopf_format=kopf_format,
+            zellen_format=zellen_format
+        )
         doc.add_paragraph("\n")
         return table
 
@@ -73,7 +43,7 @@ def run_Wortschlange(words_with_translations, template_path=None, font_size=14):
 
     # Wortschlange mit Artikeln
     wörter = [word for word, _ in words_with_translations]
-    random.shuffle(wörter)
+    rng.shuffle(wörter)
     wortschlange_mit = ''.join([word.lower().replace(" ", "") for word in wörter])
     add_wortschlange_table(wortschlange_mit)
     add_schueler_tabelle()
@@ -82,19 +52,10 @@ def run_Wortschlange(words_with_translations, template_path=None, font_size=14):
     doc.add_heading("Cherche le mot", level=1)
 
     # Wortschlange ohne Artikel
-    artikel = ["le ", "la ", "l'", "les ", "un ", "une ", "des "]
-    wörter_ohne = []
-    for word in wörter:
-        for art in artikel:
-            if word.lower().startswith(art):
-                word = word[len(art):]
-        wörter_ohne.append(word)
+    wörter_ohne = [wortform(word).ohne_artikel for word in wörter]
     wortschlange_ohne = ''.join([word.lower().replace(" ", "") for word in wörter_ohne])
     add_wortschlange_table(wortschlange_ohne)
     add_schueler_tabelle()
 
     # Dokument speichern
-    word_stream = BytesIO()
-    doc.save(word_stream)
-    word_stream.seek(0)
-    return word_stream
+    return speichere(doc)
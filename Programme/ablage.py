@@ -0,0 +1,223 @@
+"""
+Inhaltsadressierte Ablage auf der Festplatte, gemeinsam für alle Prozesse.
+
+Laufen mehrere Streamlit-Prozesse nebeneinander, hat jeder seinen eigenen
+Speicher-Cache. Über die Ablage teilen sie sich erzeugte Arbeitsblätter
+und vorab gebaute Daten (z.B. den Suchindex):
+
+    objekte/ab/abcdef…   Inhalt, Dateiname = Hash des Inhalts
+    verweise/12/123456…  Schlüssel (Hash der Anfrage) -> Hash des Inhalts
+
+Geschrieben wird immer in eine temporäre Datei und dann per os.replace
+umbenannt, Leser sehen also nie halbe Dateien. Gleicher Inhalt liegt nur
+einmal da. Die Gesamtgröße ist begrenzt: beim Aufräumen (unter einer
+Dateisperre, damit nur ein Prozess gleichzeitig löscht) werden die am
+längsten nicht benutzten Objekte entfernt. Fehlt ein Objekt beim Lesen,
+ist das ein normaler Fehltreffer.
+
+Ort: ABLAGE_DIR (Umgebungsvariable), sonst .ablage im Projektordner.
+"""
+import hashlib
+import os
+import pickle
+import tempfile
+import threading
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+STANDARD_PFAD = os.environ.get("ABLAGE_DIR", os.path.join(BASE_DIR, ".ablage"))
+
+
+def inhalts_hash(daten):
+    return hashlib.blake2b(daten, digest_size=20).hexdigest()
+
+
+def _schluessel_hash(key):
+    return hashlib.blake2b(str(key).encode("utf-8"), digest_size=20).hexdigest()
+
+
+class Ablage:
+    def __init__(self, pfad=STANDARD_PFAD, max_bytes=256 * 1024 * 1024):
+        self.pfad = pfad
+        self.max_bytes = max_bytes
+        self._objekte = os.path.join(pfad, "objekte")
+        self._verweise = os.path.join(pfad, "verweise")
+        os.makedirs(self._objekte, exist_ok=True)
+        os.makedirs(self._verweise, exist_ok=True)
+        self._lock = threading.Lock()
+        # Geschriebene Bytes seit dem letzten Aufräumen (nur dieser Prozess)
+        self._seit_aufraeumen = max_bytes
+        self.hits = 0
+        self.misses = 0
+
+    # --------------------------------------------------
+    # Pfade und Dateioperationen
+    # --------------------------------------------------
+    @staticmethod
+    def _unter(ordner, name):
+        return os.path.join(ordner, name[:2], name[2:])
+
+    def _schreibe(self, ziel, daten):
+        """Atomar: erst temporäre Datei im selben Ordner, dann umbenennen."""
+        os.makedirs(os.path.dirname(ziel), exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=os.path.dirname(ziel), prefix=".tmp-")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(daten)
+            try:
+                os.replace(tmp, ziel)
+            except PermissionError:
+                # Windows: Ziel ist gerade zum Lesen geöffnet. Es hat denselben
+                # Inhalt (Inhaltsadresse bzw. gleiche Anfrage), also verwerfen
+                os.remove(tmp)
+        except BaseException:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+            raise
+
+    @staticmethod
+    def _lies(pfad, anfassen=True):
+        try:
+            with open(pfad, "rb") as f:
+                daten = f.read()
+        except FileNotFoundError:
+            return None
+        if anfassen:
+            try:
+                os.utime(pfad)  # zuletzt benutzt (für LRU)
+            except OSError:
+                pass
+        return daten
+
+    @contextmanager
+    def _sperre(self):
+        """Exklusive Sperre über Prozesse hinweg (für das Aufräumen)."""
+        with open(os.path.join(self.pfad, ".sperre"), "a+b") as f:
+            if fcntl:
+                fcntl.flock(f, fcntl.LOCK_EX)
+            else:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+            try:
+                yield
+            finally:
+                if fcntl:
+                    fcntl.flock(f, fcntl.LOCK_UN)
+                else:
+                    f.seek(0)
+                    msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+    # --------------------------------------------------
+    # Zugriff
+    # --------------------------------------------------
+    def get(self, key):
+        """Bytes zum Schlüssel oder None."""
+        verweis = self._lies(self._unter(self._verweise, _schluessel_hash(key)))
+        daten = None
+        if verweis is not None:
+            digest = verweis.decode("ascii")
+            daten = self._lies(self._unter(self._objekte, digest))
+            if daten is not None and inhalts_hash(daten) != digest:
+                daten = None  # beschädigt, wird beim nächsten put überschrieben
+        with self._lock:
+            if daten is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return daten
+
+    def put(self, key, daten):
+        """Legt die Bytes ab und liefert ihren Inhalts-Hash."""
+        digest = inhalts_hash(daten)
+        objekt = self._unter(self._objekte, digest)
+        if os.path.exists(objekt):
+            try:
+                os.utime(objekt)
+            except OSError:
+                pass
+        else:
+            self._schreibe(objekt, daten)
+        self._schreibe(self._unter(self._verweise, _schluessel_hash(key)), digest.encode("ascii"))
+
+        with self._lock:
+            self._seit_aufraeumen += len(daten)
+            aufraeumen = self._seit_aufraeumen > self.max_bytes // 20
+            if aufraeumen:
+                self._seit_aufraeumen = 0
+        if aufraeumen:
+            self.aufraeumen()
+        return digest
+
+    def hole_oder_baue(self, key, baue, dumps=pickle.dumps, loads=pickle.loads):
+        """Gespeichertes Objekt laden oder mit baue() erzeugen und ablegen."""
+        daten = self.get(key)
+        if daten is not None:
+            return loads(daten)
+        wert = baue()
+        self.put(key, dumps(wert))
+        return wert
+
+    # --------------------------------------------------
+    # Aufräumen
+    # --------------------------------------------------
+    def _dateien(self, ordner):
+        for unterordner in os.scandir(ordner):
+            if not unterordner.is_dir():
+                continue
+            for eintrag in os.scandir(unterordner.path):
+                if eintrag.name.startswith(".tmp-"):
+                    continue
+                try:
+                    stat = eintrag.stat()
+                except FileNotFoundError:
+                    continue
+                yield eintrag.path, stat.st_mtime_ns, stat.st_size
+
+    def groesse(self):
+        return sum(size for _, _, size in self._dateien(self._objekte))
+
+    def aufraeumen(self):
+        """Älteste Objekte löschen, bis die Ablage unter max_bytes liegt."""
+        with self._sperre():
+            objekte = sorted(self._dateien(self._objekte), key=lambda d: d[1])
+            gesamt = sum(size for _, _, size in objekte)
+            for pfad, _, size in objekte:
+                if gesamt <= self.max_bytes:
+                    break
+                try:
+                    os.remove(pfad)
+                except FileNotFoundError:
+                    pass
+                gesamt -= size
+
+            # Verweise auf gelöschte Objekte entfernen
+            for pfad, _, _ in list(self._dateien(self._verweise)):
+                verweis = self._lies(pfad, anfassen=False)
+                if verweis and not os.path.exists(self._unter(self._objekte, verweis.decode("ascii"))):
+                    try:
+                        os.remove(pfad)
+                    except FileNotFoundError:
+                        pass
+
+
+# ======================================================
+# 📦 STANDARD-ABLAGE
+# ======================================================
+
+_standard = None
+_standard_lock = threading.Lock()
+
+
+def standard():
+    """Die Ablage unter STANDARD_PFAD (einmal pro Prozess angelegt)."""
+    global _standard
+    with _standard_lock:
+        if _standard is None:
+            _standard = Ablage()
+        return _standard
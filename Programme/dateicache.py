@@ -0,0 +1,131 @@
+"""
+Datei-Cache, der sich selbst invalidiert.
+
+Einträge sind an den Pfad gebunden und werden beim Zugriff mit
+(mtime_ns, size) der Datei bzw. des Ordners verglichen. Hat sich die
+Signatur geändert, wird bei Dateien zusätzlich der Inhalts-Hash geprüft:
+nur wirklich geänderte Dateien werden neu geparst, alles andere bleibt warm.
+Die Anzahl der Einträge ist begrenzt (LRU).
+"""
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+
+
+def signatur(path):
+    stat = os.stat(path)
+    return stat.st_mtime_ns, stat.st_size
+
+
+def inhalts_hash(data):
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+class DateiCache:
+    def __init__(self, max_entries=512):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def _get(self, key, sig):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == sig:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return True, entry
+            self.misses += 1
+            return False, entry
+
+    def _put(self, key, entry):
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def datei(self, path, parse):
+        """
+        parse(bytes) -> Wert. Liefert (Wert, Inhalts-Hash).
+        Bei unveränderter Signatur wird die Datei gar nicht gelesen.
+        """
+        key = ("datei", os.path.abspath(path))
+        sig = signatur(path)
+        hit, entry = self._get(key, sig)
+        if hit:
+            return entry[2], entry[1]
+
+        with open(path, "rb") as f:
+            data = f.read()
+        digest = inhalts_hash(data)
+        if entry is not None and entry[1] == digest:
+            value = entry[2]  # nur "angefasst", Inhalt gleich
+        else:
+            value = parse(data)
+        self._put(key, (sig, digest, value))
+        return value, digest
+
+    def ordner(self, path, scan):
+        """scan(path) -> Wert; neu eingelesen, wenn sich der Ordner geändert hat."""
+        key = ("ordner", scan.__name__, os.path.abspath(path))
+        if not os.path.isdir(path):
+            return scan(path)
+        sig = signatur(path)
+        hit, entry = self._get(key, sig)
+        if hit:
+            return entry[2]
+        value = scan(path)
+        self._put(key, (sig, None, value))
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+# ======================================================
+# 📦 STANDARD-CACHE + HELFER (wie früher in app.py)
+# ======================================================
+
+cache = DateiCache()
+
+
+def _scan_dirs(path):
+    if not os.path.exists(path):
+        return []
+    return sorted([
+        d for d in os.listdir(path)
+        if os.path.isdir(os.path.join(path, d))
+    ])
+
+
+def _scan_json_files(path):
+    if not os.path.exists(path):
+        return []
+    return sorted([
+        f for f in os.listdir(path)
+        if f.endswith(".json")
+    ])
+
+
+def list_dirs(path):
+    return cache.ordner(path, _scan_dirs)
+
+
+def list_json_files(path):
+    return cache.ordner(path, _scan_json_files)
+
+
+def load_json_mit_hash(path):
+    return cache.datei(path, lambda data: json.loads(data.decode("utf-8")))
+
+
+def load_json(path):
+    return load_json_mit_hash(path)[0]
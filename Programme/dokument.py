@@ -0,0 +1,175 @@
+"""
+Arbeitsblätter als XML schreiben, mit zwei Backends.
+
+Überschriften, Absätze, Seitenumbrüche und Tabellen werden als fertiges
+WordprocessingML erzeugt (Tabellen über Programme/tabellen.py). Wohin das
+XML geht, entscheidet das Backend:
+
+    "docx"   – in ein python-docx-Dokument auf Basis der Vorlage (wie bisher)
+    "stream" – direkt in die ZIP-Datei: alle anderen Teile der Vorlage
+               (Formatvorlagen, Kopf-/Fußzeilen, Design …) werden unverändert
+               kopiert, word/document.xml wird Stück für Stück komprimiert
+               geschrieben. Es entsteht kein Objektbaum, der Speicherbedarf
+               wächst kaum mit der Länge des Dokuments.
+
+    doc = neues_dokument(template_path, backend="stream")
+    doc.ueberschrift("vocabulaire", level=0, fmt=Zellformat(fett=True))
+    doc.tabelle(zeilen, kopfzeile=["Wort", "Übersetzung"], zeilenhoehe_cm=1)
+    word_stream = doc.speichern()
+
+Gespeichert wird mit festen Zeitstempeln in der ZIP-Datei: gleicher Inhalt
+ergibt byte-gleiche .docx-Dateien (wichtig für Varianten mit Seed).
+"""
+import zipfile
+from io import BytesIO
+from xml.sax.saxutils import escape
+
+from docx.oxml import parse_xml
+from docx.oxml.ns import nsdecls
+
+from Programme.tabellen import OHNE_FORMAT, breiten_twips, style_id, tabelle_xml, text_xml
+from Programme.vorlagen import DOCUMENT_XML, lade_rohvorlage, lade_vorlage
+
+BACKENDS = ("docx", "stream")
+
+# Zeitstempel aller Teile (wie in der Vorlage)
+FESTE_ZEIT = (1980, 1, 1, 0, 0, 0)
+
+
+def _zip_info(name):
+    info = zipfile.ZipInfo(name, FESTE_ZEIT)
+    info.compress_type = zipfile.ZIP_DEFLATED
+    info.create_system = 0  # sonst je nach Betriebssystem verschieden
+    return info
+
+
+def feste_zeitstempel(zip_stream):
+    """Schreibt eine ZIP-Datei neu, alle Teile mit FESTE_ZEIT."""
+    ziel = BytesIO()
+    with zipfile.ZipFile(zip_stream) as quelle, zipfile.ZipFile(ziel, "w") as zf:
+        for info in quelle.infolist():
+            zf.writestr(_zip_info(info.filename), quelle.read(info))
+    ziel.seek(0)
+    return ziel
+
+
+def speichere(doc):
+    """
+    python-docx-Dokument als BytesIO. doc.save() stempelt jeden Teil mit
+    der aktuellen Uhrzeit, daher werden die Zeitstempel danach festgesetzt.
+    """
+    roh = BytesIO()
+    doc.save(roh)
+    roh.seek(0)
+    return feste_zeitstempel(roh)
+
+
+def heading_style(level):
+    """Formatvorlage wie bei doc.add_heading()."""
+    return "Title" if level == 0 else "Heading %d" % level
+
+
+class _Dokument:
+    """Gemeinsamer Teil; Unterklassen liefern _ns, _schreibe(_tabelle), _style_id und blockbreite."""
+
+    def _absatz_xml(self, text, style_id=None, fmt=OHNE_FORMAT):
+        ppr = ('<w:pStyle w:val="%s"/>' % escape(style_id, {'"': "&quot;"}) if style_id else "") + fmt.ppr
+        ppr = "<w:pPr>%s</w:pPr>" % ppr if ppr else ""
+        run = "<w:r>%s%s</w:r>" % (fmt.rpr, text_xml(text)) if text else ""
+        return "<w:p%s>%s%s</w:p>" % (self._ns, ppr, run)
+
+    def ueberschrift(self, text, level=1, fmt=OHNE_FORMAT):
+        self._schreibe(self._absatz_xml(text, self._style_id(heading_style(level)), fmt))
+
+    def absatz(self, text="", style=None, fmt=OHNE_FORMAT):
+        self._schreibe(self._absatz_xml(text, self._style_id(style) if style else None, fmt))
+
+    def seitenumbruch(self):
+        self._schreibe('<w:p%s><w:r><w:br w:type="page"/></w:r></w:p>' % self._ns)
+
+    def tabelle(self, zeilen, kopfzeile=None, spalten=None, style="Table Grid",
+                breiten=None, **optionen):
+        """Wie tabellen.baue_tabelle()."""
+        if spalten is None:
+            spalten = len(kopfzeile) if kopfzeile is not None else len(zeilen[0])
+        if breiten is not None:
+            optionen.setdefault("autofit", False)
+        self._schreibe_tabelle(tabelle_xml(
+            zeilen,
+            breiten_twips(self.blockbreite, spalten, breiten),
+            kopfzeile=kopfzeile,
+            style_id=self._style_id(style) if style else None,
+            namespaces=bool(self._ns),
+            **optionen
+        ))
+
+
+class DocxDokument(_Dokument):
+    """Schreibt in ein python-docx-Dokument (Kopie der Vorlage)."""
+
+    _ns = " " + nsdecls("w")
+
+    def __init__(self, template_path=None):
+        self.doc = lade_vorlage(template_path)
+        self.blockbreite = self.doc._block_width
+
+    def _style_id(self, name):
+        return style_id(self.doc, name)
+
+    def _schreibe(self, xml):
+        self.doc.element.body._insert_p(parse_xml(xml))
+
+    def _schreibe_tabelle(self, stuecke):
+        self.doc.element.body._insert_tbl(parse_xml("".join(stuecke)))
+
+    def speichern(self):
+        return speichere(self.doc)
+
+
+class StreamDokument(_Dokument):
+    """
+    Schreibt document.xml direkt in die ZIP-Ausgabe.
+    ziel: Datei-Objekt oder Pfad (Standard: BytesIO, wird von speichern() zurückgegeben).
+    """
+
+    _ns = ""  # der Namespace ist am w:document der Vorlage deklariert
+
+    def __init__(self, template_path=None, ziel=None):
+        self.vorlage = lade_rohvorlage(template_path)
+        self.blockbreite = self.vorlage.blockbreite
+        self._ziel = BytesIO() if ziel is None else ziel
+        self._zip = zipfile.ZipFile(self._ziel, "w", zipfile.ZIP_DEFLATED)
+
+        # Alle festen Teile zuerst: solange document.xml offen ist, kann
+        # nichts anderes in die ZIP-Datei geschrieben werden
+        for info, daten in self.vorlage.teile:
+            self._zip.writestr(_zip_info(info.filename), daten)
+
+        self._document = self._zip.open(_zip_info(DOCUMENT_XML), "w")
+        self._document.write(self.vorlage.kopf)
+
+    def _style_id(self, name):
+        return self.vorlage.style_id(name)
+
+    def _schreibe(self, xml):
+        self._document.write(xml.encode("utf-8"))
+
+    def _schreibe_tabelle(self, stuecke):
+        for stueck in stuecke:
+            self._document.write(stueck.encode("utf-8"))
+
+    def speichern(self):
+        self._document.write(self.vorlage.fuss)
+        self._document.close()
+        self._zip.close()
+        if isinstance(self._ziel, BytesIO):
+            self._ziel.seek(0)
+        return self._ziel
+
+
+def neues_dokument(template_path=None, backend="docx"):
+    if backend == "docx":
+        return DocxDokument(template_path)
+    if backend == "stream":
+        return StreamDokument(template_path)
+    raise ValueError(f"Unbekanntes Backend: {backend} (erlaubt: {', '.join(BACKENDS)})")
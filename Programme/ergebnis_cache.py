@@ -0,0 +1,247 @@
+"""
+Cache für fertige Arbeitsblätter vor dem Generator-Register.
+
+Gleiche Anfrage (Programm, Wortpaare, Vorlage, Optionen, Seed) liefert
+die gespeicherten .docx-Bytes, ohne den Generator erneut laufen zu lassen.
+Gecacht wird nur, was sich wiederholen lässt:
+
+    - Programme mit Seed (SEED_PROGRAMME), wenn ein Seed angegeben ist
+    - Programme ohne Zufall (FESTE_PROGRAMME)
+
+Alles andere wird wie bisher direkt erzeugt. Der Cache hat ein Budget
+in Bytes und verdrängt die am längsten nicht benutzten Einträge (LRU).
+
+Zum Schlüssel gehört der Stand des Codes (code_stand): nach einem Update
+werden alte Arbeitsblätter aus der Ablage nicht mehr ausgeliefert.
+
+Hinter dem Speicher-Cache liegt optional eine Ablage auf der Festplatte
+(Programme/ablage.py), die sich alle Streamlit-Prozesse teilen.
+
+erstelle_alle() erzeugt mehrere Arbeitsblätter parallel im gemeinsamen
+Prozess-Pool (prozesse.gemeinsamer_pool) und liefert jedes, sobald es
+fertig ist. Fehlen nur wenige im Cache, werden sie direkt erzeugt.
+"""
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+from concurrent.futures import BrokenExecutor, as_completed
+from io import BytesIO
+
+from Programme import ablage, generatoren, prozesse
+from Programme.dateicache import signatur
+from Programme.generatoren import FESTE_PROGRAMME, SEED_PROGRAMME
+
+
+class NichtCachebar(TypeError):
+    pass
+
+
+def _normalisiere(wert):
+    """Wandelt ein Argument in eine eindeutige, hashbare Form."""
+    if wert is None or isinstance(wert, (bool, int, float)):
+        return wert
+    if isinstance(wert, str):
+        # Dateipfade (z.B. die Vorlage) zählen mit ihrem Stand
+        if wert.endswith(".docx") and os.path.isfile(wert):
+            return ("datei", os.path.abspath(wert), signatur(wert))
+        return wert
+    if isinstance(wert, (list, tuple)):
+        return tuple(_normalisiere(w) for w in wert)
+    if isinstance(wert, dict):
+        return ("dict", tuple(sorted((str(k), _normalisiere(v)) for k, v in wert.items())))
+    if hasattr(wert, "schluessel"):
+        return (type(wert).__name__, wert.schluessel())
+    raise NichtCachebar(f"{type(wert).__name__} kann nicht Teil des Schlüssels sein")
+
+
+@lru_cache(maxsize=1)
+def code_stand():
+    """
+    Hash aller Quelltexte in Programme/ (einmal pro Prozess). Auch Hilfsmodule
+    (sprache, suchgitter, dokument, …) bestimmen das Ergebnis, daher alle.
+    """
+    ordner = os.path.dirname(os.path.abspath(__file__))
+    h = hashlib.blake2b(digest_size=16)
+    for name in sorted(os.listdir(ordner)):
+        if name.endswith(".py"):
+            with open(os.path.join(ordner, name), "rb") as f:
+                h.update(name.encode("utf-8") + b"\0" + f.read() + b"\0")
+    return h.hexdigest()
+
+
+def schluessel(name, args, kwargs):
+    """Hash der Anfrage oder None, wenn das Ergebnis vom Zufall abhängt."""
+    if name in SEED_PROGRAMME:
+        if kwargs.get("seed") is None:
+            return None
+    elif name not in FESTE_PROGRAMME:
+        return None
+    try:
+        teile = (code_stand(), name, _normalisiere(args), _normalisiere(kwargs))
+    except NichtCachebar:
+        return None
+    return hashlib.blake2b(repr(teile).encode("utf-8"), digest_size=16).hexdigest()
+
+
+# Bis zu so vielen fehlenden Arbeitsblättern wird ohne Pool erzeugt
+SERIELL_BIS = 2
+
+
+def _erzeuge(name, args, kwargs):
+    """Läuft im Arbeitsprozess (oder direkt, siehe SERIELL_BIS)."""
+    return generatoren.erstelle(name, *args, **kwargs).getvalue()
+
+
+class ErgebnisCache:
+    def __init__(self, max_bytes=64 * 1024 * 1024, ablage=None):
+        """ablage: optionale Ablage (zweite Stufe, prozessübergreifend)"""
+        self.max_bytes = max_bytes
+        self.ablage = ablage
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    @property
+    def groesse(self):
+        """Belegter Speicher in Bytes."""
+        return self._bytes
+
+    def get(self, key):
+        with self._lock:
+            daten = self._entries.get(key)
+            if daten is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return daten
+
+    def put(self, key, daten):
+        if len(daten) > self.max_bytes:
+            return
+        with self._lock:
+            alt = self._entries.pop(key, None)
+            if alt is not None:
+                self._bytes -= len(alt)
+            self._entries[key] = daten
+            self._bytes += len(daten)
+            while self._bytes > self.max_bytes:
+                _, verdraengt = self._entries.popitem(last=False)
+                self._bytes -= len(verdraengt)
+                self.evictions += 1
+
+    def _nachschlagen(self, key):
+        """Erst im Speicher, dann in der Ablage."""
+        daten = self.get(key)
+        if daten is None and self.ablage is not None:
+            daten = self.ablage.get(key)
+            if daten is not None:
+                self.put(key, daten)
+        return daten
+
+    def _ablegen(self, key, daten):
+        self.put(key, daten)
+        if self.ablage is not None:
+            self.ablage.put(key, daten)
+
+    def erstelle(self, name, *args, **kwargs):
+        """Wie generatoren.erstelle(), aber mit Cache. Liefert immer ein neues BytesIO."""
+        key = schluessel(name, args, kwargs)
+        if key is None:
+            return generatoren.erstelle(name, *args, **kwargs)
+
+        daten = self._nachschlagen(key)
+        if daten is None:
+            daten = generatoren.erstelle(name, *args, **kwargs).getvalue()
+            self._ablegen(key, daten)
+        return BytesIO(daten)
+
+    def erstelle_alle(self, auftraege):
+        """
+        Mehrere Arbeitsblätter auf einmal, auftraege = [(Name, args, kwargs)].
+
+        Treffer aus dem Cache kommen sofort. Fehlen mehr als SERIELL_BIS,
+        werden sie parallel im gemeinsamen Prozess-Pool erzeugt, sonst direkt
+        hier (ein Pool lohnt sich dafür nicht). Liefert (Index, BytesIO) bzw.
+        (Index, Exception) in der Reihenfolge, in der sie fertig werden.
+        """
+        offen = {}
+        for index, (name, args, kwargs) in enumerate(auftraege):
+            key = schluessel(name, args, kwargs)
+            daten = None if key is None else self._nachschlagen(key)
+            if daten is None:
+                offen[index] = key
+            else:
+                yield index, BytesIO(daten)
+
+        if len(offen) <= SERIELL_BIS:
+            for index, key in offen.items():
+                try:
+                    daten = _erzeuge(*auftraege[index])
+                except Exception as e:
+                    yield index, e
+                    continue
+                if key is not None:
+                    self._ablegen(key, daten)
+                yield index, BytesIO(daten)
+            return
+
+        pool = prozesse.gemeinsamer_pool()
+        futures = {
+            pool.submit(_erzeuge, *auftraege[index]): index
+            for index in offen
+        }
+        try:
+            for future in as_completed(futures):
+                index = futures[future]
+                try:
+                    daten = future.result()
+                except BrokenExecutor as e:
+                    prozesse.verwerfen(pool)
+                    yield index, e
+                    continue
+                except Exception as e:
+                    yield index, e
+                    continue
+                if offen[index] is not None:
+                    self._ablegen(offen[index], daten)
+                yield index, BytesIO(daten)
+        finally:
+            # Seite verlassen: was noch nicht läuft, nicht mehr erzeugen
+            for future in futures:
+                future.cancel()
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+
+# ======================================================
+# 📦 STANDARD-CACHE (einer pro Prozess)
+# ======================================================
+
+cache = ErgebnisCache()
+
+
+def _mit_ablage():
+    # Die Ablage wird erst beim ersten Arbeitsblatt angelegt, nicht beim Import
+    if cache.ablage is None:
+        cache.ablage = ablage.standard()
+    return cache
+
+
+def erstelle(name, *args, **kwargs):
+    return _mit_ablage().erstelle(name, *args, **kwargs)
+
+
+def erstelle_alle(auftraege):
+    return _mit_ablage().erstelle_alle(auftraege)
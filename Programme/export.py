@@ -0,0 +1,120 @@
+"""
+Export ganzer Bücher: jedes Programm für jedes Kapitel, als eine ZIP-Datei.
+
+Die Arbeitsblätter werden parallel in einem Prozess-Pool erzeugt (ein
+Prozess pro CPU-Kern) und in der Reihenfolge, in der sie fertig werden,
+in die ZIP-Datei geschrieben. Die Dateinamen sind fest:
+
+    {Buch}/{Kapitel}/{Programm}.docx
+
+Schlägt ein einzelnes Arbeitsblatt fehl, läuft der Rest weiter; die
+Fehler stehen in FEHLER.txt in der ZIP-Datei und werden zurückgegeben.
+
+    python -m Programme.export [ziel.zip]
+"""
+import os
+import sys
+import zipfile
+from concurrent.futures import as_completed
+from io import BytesIO
+
+from Programme import generatoren, prozesse, vokabel_db
+from Programme.generatoren import VOKABEL_PROGRAMME
+
+FEHLER_DATEI = "FEHLER.txt"
+
+
+def dateiname(book, chapter, program):
+    return f"{book}/{chapter}/{program}.docx"
+
+
+def kapitel_paare(conn, book, chapter):
+    """Alle (Wort, Übersetzung) eines Kapitels, ohne doppelte Wörter."""
+    sections = vokabel_db.list_sections(conn, book, chapter)
+    data = vokabel_db.load_sections(conn, book, chapter, sections)
+    unique = {
+        item["word"]: item["translation"]
+        for item in data if "word" in item and "translation" in item
+    }
+    return list(unique.items())
+
+
+def buch_auftraege(conn, books=None, programme=VOKABEL_PROGRAMME):
+    """
+    Liste von (Dateiname, Programm, Paare) für alle Kombinationen aus
+    Buch, Kapitel und Programm. Kapitel ohne Wörter werden übersprungen.
+    """
+    if books is None:
+        books = vokabel_db.list_books(conn)
+    auftraege = []
+    for book in books:
+        for chapter in vokabel_db.list_chapters(conn, book):
+            paare = kapitel_paare(conn, book, chapter)
+            if not paare:
+                continue
+            for program in programme:
+                auftraege.append((dateiname(book, chapter, program), program, paare))
+    return auftraege
+
+
+def _erstelle(name, program, paare, template_path):
+    """Läuft im Arbeitsprozess: (Name, Bytes, None) oder (Name, None, Fehler)."""
+    try:
+        return name, generatoren.erstelle(program, list(paare), template_path).getvalue(), None
+    except Exception as e:
+        return name, None, f"{type(e).__name__}: {e}"
+
+
+def exportiere_zip(auftraege, template_path, ziel=None, max_workers=None, fortschritt=None):
+    """
+    Erzeugt alle Aufträge parallel und schreibt sie in eine ZIP-Datei.
+
+    ziel:        Datei-Objekt oder Pfad (Standard: BytesIO)
+    fortschritt: optional, wird nach jedem Arbeitsblatt mit
+                 (fertig, gesamt, Dateiname) aufgerufen
+    Rückgabe:    (ziel, {Dateiname: Fehlermeldung})
+    """
+    ziel = BytesIO() if ziel is None else ziel
+    fehler = {}
+    gesamt = len(auftraege)
+
+    # .docx ist schon komprimiert, daher ohne erneute Kompression
+    with zipfile.ZipFile(ziel, "w", zipfile.ZIP_STORED) as zf, \
+            prozesse.pool(max_workers) as pool:
+        futures = {
+            pool.submit(_erstelle, name, program, paare, template_path): name
+            for name, program, paare in auftraege
+        }
+        for fertig, future in enumerate(as_completed(futures), 1):
+            name = futures[future]
+            try:
+                _, daten, meldung = future.result()
+            except Exception as e:  # z.B. abgestürzter Arbeitsprozess
+                daten, meldung = None, f"{type(e).__name__}: {e}"
+            if daten is None:
+                fehler[name] = meldung
+            else:
+                zf.writestr(name, daten)
+            if fortschritt:
+                fortschritt(fertig, gesamt, name)
+
+        if fehler:
+            zf.writestr(FEHLER_DATEI, "".join(
+                f"{name}: {meldung}\n" for name, meldung in sorted(fehler.items())
+            ))
+
+    if isinstance(ziel, BytesIO):
+        ziel.seek(0)
+    return ziel, fehler
+
+
+if __name__ == "__main__":
+    ziel = sys.argv[1] if len(sys.argv) > 1 else "Arbeitsblaetter.zip"
+    auftraege = buch_auftraege(vokabel_db.connect())
+    _, fehler = exportiere_zip(
+        auftraege,
+        os.path.join(vokabel_db.BASE_DIR, "Vorlagen", "Vorlage Vokabellisten.docx"),
+        ziel,
+        fortschritt=lambda fertig, gesamt, name: print(f"[{fertig}/{gesamt}] {name}")
+    )
+    print(f"{len(auftraege) - len(fehler)} Arbeitsblätter in {ziel}, {len(fehler)} Fehler")
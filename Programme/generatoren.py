@@ -0,0 +1,43 @@
+"""
+Register aller Arbeitsblatt-Programme.
+
+Die Generatoren (und damit python-docx/lxml) werden erst beim ersten
+Aufruf importiert, nicht schon beim Start von app.py.
+"""
+import importlib
+from functools import lru_cache
+
+# Programmname -> (Modul, Funktion)
+PROGRAMME = {
+    "Vokabelsuchgitter": ("Programme.Vokabelsuchgitter", "run_Vokabelsuchgitter"),
+    "Vokabelrätsel": ("Programme.Vokabelrätsel", "run_Rätsel"),
+    "Wortschlange": ("Programme.Wortschlange", "run_Wortschlange"),
+    "Zuordnen": ("Programme.Worte_verbinden", "Worte_zuordnen"),
+    "Vokabelliste": ("Programme.Listen", "Vokabellisten"),
+    "Konjugationen": ("Programme.Konjugationen_Unterstriche", "run_Unterstriche_Konjugationen"),
+    "Konjugationstabelle": ("Programme.Konjugationstabelle", "run_konjugationstabelle"),
+    "Differenzierung": ("Programme.worksheet_generator", "generate_worksheets_streamlit"),
+}
+
+# Programme, die eine Liste von (Wort, Übersetzung) bekommen
+VOKABEL_PROGRAMME = ["Vokabelsuchgitter", "Vokabelrätsel", "Wortschlange", "Zuordnen", "Vokabelliste"]
+
+# Programme mit seed-Parameter (Varianten, siehe Programme/varianten.py)
+SEED_PROGRAMME = ["Vokabelsuchgitter", "Vokabelrätsel", "Wortschlange", "Zuordnen", "Konjugationen"]
+
+# Programme ohne Zufall: gleiche Eingabe ergibt immer dasselbe Dokument
+FESTE_PROGRAMME = ["Vokabelliste"]
+
+
+@lru_cache(maxsize=None)
+def lade(name):
+    """Importiert das Modul beim ersten Gebrauch und liefert die Einstiegsfunktion."""
+    try:
+        module_name, func_name = PROGRAMME[name]
+    except KeyError:
+        raise ValueError(f"Unbekanntes Programm: {name}") from None
+    return getattr(importlib.import_module(module_name), func_name)
+
+
+def erstelle(name, *args, **kwargs):
+    return lade(name)(*args, **kwargs)
@@ -0,0 +1,245 @@
+"""
+Kompakte Konjugationstabelle für den Verb-Tab.
+
+Alle Formen liegen als internierte Strings in einer Liste; ein flaches
+array verweist für jede (Verb, Zeitform, Person) auf den Index der Form:
+
+    forms[(verb_id * len(tenses) + tense_id) * len(persons) + person_id]
+
+Fehlt eine Form, steht dort der Infinitiv (wie bisher .get(p, verb)).
+Die Tabelle wird einmal pro Prozess geladen (st.cache_resource in app.py).
+
+Beim Laden werden für jede Form auch die Unterstrich-Masken und die
+Elision (je -> j’) berechnet, parallel zu strings (masken[i] gehört zu
+strings[i]); der Konjugationstest schlägt sie nur noch nach.
+"""
+import hashlib
+import math
+import random
+import sys
+from array import array
+
+from Programme.sprache import wortform
+
+PERSONALPRONOMEN = ["je", "tu", "il", "elle", "on", "nous", "vous", "ils", "elles"]
+
+
+class _Stapel:
+    """
+    Ziehen ohne Zurücklegen aus immer neu gemischten Stapeln: bis alle
+    Werte einmal dran waren, kommt keiner doppelt (gleichmäßige Abdeckung).
+    """
+
+    def __init__(self, werte, rng):
+        self.werte = list(werte)
+        self.rng = rng
+        self.karten = []
+
+    def _neuer_stapel(self):
+        neu = list(self.werte)
+        self.rng.shuffle(neu)
+        # unter die restlichen Karten, gezogen wird von oben (hinten)
+        self.karten = neu + self.karten
+
+    def ziehe(self, verboten=()):
+        """Oberste Karte, die nicht verboten ist (mindestens ein Wert muss erlaubt sein)."""
+        if not self.karten:
+            self._neuer_stapel()
+        while True:
+            for i in range(len(self.karten) - 1, -1, -1):
+                if self.karten[i] not in verboten:
+                    return self.karten.pop(i)
+            self._neuer_stapel()
+
+
+class KonjugationsTabelle:
+    def __init__(self, rows):
+        """
+        rows: iterierbar über (Infinitiv, Zeitform, Person, Form),
+        Reihenfolge der Verben/Zeitformen wie in den Daten.
+        """
+        rows = list(rows)
+
+        self.verbs = []
+        self.tenses = []
+        self.persons = list(PERSONALPRONOMEN)
+        self.verb_ids = {}
+        self.tense_ids = {}
+        self.person_ids = {p: i for i, p in enumerate(self.persons)}
+
+        for verb, tense, person, _ in rows:
+            if verb not in self.verb_ids:
+                self.verb_ids[verb] = len(self.verbs)
+                self.verbs.append(verb)
+            if tense not in self.tense_ids:
+                self.tense_ids[tense] = len(self.tenses)
+                self.tenses.append(tense)
+            if person not in self.person_ids:
+                self.person_ids[person] = len(self.persons)
+                self.persons.append(person)
+
+        self.strings = []
+        string_ids = {}
+
+        def intern(text):
+            text = sys.intern(text)
+            if text not in string_ids:
+                string_ids[text] = len(self.strings)
+                self.strings.append(text)
+            return string_ids[text]
+
+        n_t, n_p = len(self.tenses), len(self.persons)
+        self.forms = array("I", [0]) * (len(self.verbs) * n_t * n_p)
+        self.infinitive = array("I")
+        for v, verb in enumerate(self.verbs):
+            inf = intern(verb)
+            self.infinitive.append(inf)
+            start = v * n_t * n_p
+            self.forms[start:start + n_t * n_p] = array("I", [inf]) * (n_t * n_p)
+
+        # Zeitformen, die ein Verb tatsächlich hat (für die Auswahl im Tab)
+        self._verb_tenses = [[] for _ in self.verbs]
+        for verb, tense, person, form in rows:
+            v, t, p = self.verb_ids[verb], self.tense_ids[tense], self.person_ids[person]
+            self.forms[(v * n_t + t) * n_p + p] = intern(form)
+            if t not in self._verb_tenses[v]:
+                self._verb_tenses[v].append(t)
+
+        formen = [wortform(text) for text in self.strings]
+        self.masken = [f.maske for f in formen]
+        self.erste_buchstaben = [f.erster_buchstabe for f in formen]
+        self.elision = bytearray(f.elision for f in formen)
+
+    # --------------------------------------------------
+    # Laden
+    # --------------------------------------------------
+    @classmethod
+    def from_dict(cls, words_data):
+        """Aus {Infinitiv: {Zeitform: {Person: Form}}} wie in den JSON-Dateien."""
+        return cls(
+            (verb, tense, person, form)
+            for verb, tenses in words_data.items()
+            for tense, persons in tenses.items()
+            for person, form in persons.items()
+        )
+
+    @classmethod
+    def from_db(cls, conn):
+        return cls(conn.execute(
+            "SELECT v.infinitive, f.tense, f.person, f.form FROM verb_forms f "
+            "JOIN verbs v ON v.id = f.verb_id "
+            "ORDER BY v.infinitive, f.tense_pos, f.person_pos"
+        ))
+
+    # --------------------------------------------------
+    # Zugriff
+    # --------------------------------------------------
+    def __len__(self):
+        return len(self.verbs)
+
+    def schluessel(self):
+        """Inhalts-Hash der Tabelle (für den Ergebnis-Cache), einmal berechnet."""
+        if getattr(self, "_schluessel", None) is None:
+            h = hashlib.blake2b(digest_size=16)
+            for teil in (self.verbs, self.tenses, self.persons, self.strings):
+                h.update("\x1f".join(teil).encode("utf-8") + b"\x1e")
+            h.update(self.forms.tobytes())
+            self._schluessel = h.hexdigest()
+        return self._schluessel
+
+    def zeitformen(self, verb):
+        return [self.tenses[t] for t in self._verb_tenses[self.verb_ids[verb]]]
+
+    def form(self, verb_id, tense_id, person_id):
+        n_t, n_p = len(self.tenses), len(self.persons)
+        return self.strings[self.forms[(verb_id * n_t + tense_id) * n_p + person_id]]
+
+    def form_ids(self, verb_ids, tense_id, person_ids):
+        """
+        Nummern der Formen (Index in strings, masken, …) für viele Zeilen
+        auf einmal; unbekannte Zeitform -> Infinitiv.
+        """
+        if tense_id is None:
+            return [self.infinitive[v] for v in verb_ids]
+        n_t, n_p = len(self.tenses), len(self.persons)
+        forms = self.forms
+        return [forms[(v * n_t + tense_id) * n_p + p] for v, p in zip(verb_ids, person_ids)]
+
+    def formen(self, verb_ids, tense_id, person_ids):
+        """Formen für viele Zeilen auf einmal; unbekannte Zeitform -> Infinitiv."""
+        strings = self.strings
+        return [strings[i] for i in self.form_ids(verb_ids, tense_id, person_ids)]
+
+    def ziehe(self, n, verben=None, pronomen=PERSONALPRONOMEN, rng=random):
+        """
+        Zieht n Zeilen auf einmal: Verb-IDs und je zwei Personen-IDs.
+        verben: Auswahl an Infinitiven (Standard: alle).
+        """
+        return self.ziehe_tests(1, n, verben, pronomen, rng)[0]
+
+    def ziehe_tests(self, anzahl, n, verben=None, pronomen=PERSONALPRONOMEN, rng=random):
+        """
+        anzahl verschiedene Tests mit je n Zeilen, als Liste von
+        (Verb-IDs, Personen-IDs Zeitform 1, Personen-IDs Zeitform 2).
+
+        Verben und beide Personenspalten kommen aus je einem Stapel, der
+        über alle Tests weiterläuft: jedes Verb und jede Person kommt
+        gleich oft dran (± 1). Innerhalb eines Tests wiederholt sich ein
+        Verb erst, wenn alle gewählten Verben dran waren, und eine Zeile
+        (Verb, Person 1, Person 2) erst, wenn es keine neue mehr gibt.
+        Wirft ValueError, wenn es nicht genug verschiedene Tests gibt.
+        """
+        # doppelte Einträge in der Auswahl zählen einmal
+        verb_ids = list(dict.fromkeys(self.verb_ids[v] for v in verben)) if verben else list(range(len(self.verbs)))
+        person_ids = list(dict.fromkeys(self.person_ids[p] for p in pronomen))
+        zeilen_moeglich = len(verb_ids) * len(person_ids) ** 2
+        if anzahl > 1 and math.comb(zeilen_moeglich, min(n, zeilen_moeglich)) < anzahl:
+            raise ValueError(f"Mit dieser Auswahl gibt es keine {anzahl} verschiedenen Tests")
+
+        stapel = (_Stapel(verb_ids, rng), _Stapel(person_ids, rng), _Stapel(person_ids, rng))
+        tests = []
+        gesehen = set()
+        versuche = 0
+        while len(tests) < anzahl:
+            test = self._ziehe_test(n, stapel, len(verb_ids), len(person_ids))
+            schluessel = frozenset(zip(*test))
+            if schluessel in gesehen:
+                # Nur bei sehr kleiner Auswahl wahrscheinlich, daher begrenzt
+                versuche += 1
+                if versuche > 100 * anzahl:
+                    raise ValueError(f"Keine {anzahl} verschiedenen Tests gefunden")
+                continue
+            gesehen.add(schluessel)
+            tests.append(test)
+        return tests
+
+    @staticmethod
+    def _ziehe_test(n, stapel, n_verben, n_personen):
+        verben, personen_1, personen_2 = stapel
+        verb_ids, p1_ids, p2_ids = [], [], []
+        runde = set()      # Verben seit der letzten vollständigen Runde
+        benutzt = {}       # (Verb, Person 1) -> schon benutzte Personen 2
+        voll_p1 = {}       # Verb -> Personen 1 ohne freie Person 2
+        voll = set()       # Verben ohne freie Zeile
+        for _ in range(n):
+            if len(voll) == n_verben:
+                # Alle Zeilen benutzt: ab jetzt wiederholen sie sich
+                benutzt, voll_p1, voll = {}, {}, set()
+            if len(runde | voll) == n_verben:
+                runde = set()
+
+            v = verben.ziehe(runde | voll)
+            p1 = personen_1.ziehe(voll_p1.get(v, ()))
+            schon = benutzt.setdefault((v, p1), set())
+            p2 = personen_2.ziehe(schon)
+
+            schon.add(p2)
+            if len(schon) == n_personen:
+                voll_p1.setdefault(v, set()).add(p1)
+                if len(voll_p1[v]) == n_personen:
+                    voll.add(v)
+            runde.add(v)
+            verb_ids.append(v)
+            p1_ids.append(p1)
+            p2_ids.append(p2)
+        return verb_ids, p1_ids, p2_ids
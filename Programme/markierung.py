@@ -0,0 +1,145 @@
+"""
+Lücken im Differenzierungs-Text automatisch markieren.
+
+Statt jede Lücke von Hand in [eckige Klammern] zu setzen, sucht ein
+Aho-Corasick-Automat alle Einträge einer Wortliste (Wörterbuch oder
+Kapitel) in einem einzigen Durchgang durch den Text:
+
+    automat = Automat(eintraege)    # einmal pro Wortliste (gecacht in app.py)
+    markiere(text, automat)         # "Je ne l'aime [pas du tout]."
+
+    - nur ganze Wörter, Groß-/Kleinschreibung und Apostroph-Form egal
+    - Einträge werden auch ohne Artikel gefunden ("le chat" -> "chat"),
+      Varianten wie "Madame / Mme" einzeln, Satzzeichen am Ende fallen weg
+    - überlappen sich Treffer, gewinnt der früheste, bei gleichem Anfang
+      der längste ("pas du tout" statt "pas")
+    - schon von Hand markierte Stellen bleiben, wie sie sind
+
+Sehr kurze Einträge (à, de, en, …) werden nicht markiert, sonst wäre fast
+jedes zweite Wort eine Lücke.
+"""
+from collections import deque
+
+from Programme.sprache import suchformen, vergleichsform
+from Programme.worksheet_generator import luecken, zerlege
+
+# Einträge mit weniger Buchstaben werden nicht gesucht
+MIN_LAENGE = 3
+
+class Automat:
+    # Bei Änderungen am Aufbau erhöhen (gespeicherte Automaten in der Ablage veralten)
+    VERSION = 1
+
+    def __init__(self, eintraege, min_laenge=MIN_LAENGE):
+        # Zustand 0 ist die Wurzel
+        self.kinder = [{}]      # Zustand -> {Zeichen: Folgezustand}
+        self.laenge = [0]       # Länge des Eintrags, der hier endet (0 = keiner)
+
+        muster = {
+            form
+            for eintrag in eintraege if "word" in eintrag
+            for form in suchformen(eintrag["word"])
+            if len(form) >= min_laenge
+        }
+        for form in sorted(muster):
+            self._einfuegen(form)
+        self.anzahl = len(muster)
+        self._verknuepfen()
+
+    def __len__(self):
+        return self.anzahl
+
+    def _einfuegen(self, form):
+        zustand = 0
+        for zeichen in form:
+            folge = self.kinder[zustand].get(zeichen)
+            if folge is None:
+                folge = len(self.kinder)
+                self.kinder[zustand][zeichen] = folge
+                self.kinder.append({})
+                self.laenge.append(0)
+            zustand = folge
+        self.laenge[zustand] = len(form)
+
+    def _verknuepfen(self):
+        """
+        Fehlerverweise (längstes echtes Suffix, das auch Präfix eines
+        Eintrags ist) und Ausgabeverweise (nächster Zustand auf dieser
+        Kette, an dem ein Eintrag endet), Ebene für Ebene.
+        """
+        kinder = self.kinder
+        self.fehler = [0] * len(kinder)
+        self.ausgabe = [0] * len(kinder)
+        warteschlange = deque(kinder[0].values())
+        while warteschlange:
+            zustand = warteschlange.popleft()
+            zurueck = self.fehler[zustand]
+            self.ausgabe[zustand] = zustand if self.laenge[zustand] else self.ausgabe[zurueck]
+            for zeichen, folge in kinder[zustand].items():
+                f = zurueck
+                while f and zeichen not in kinder[f]:
+                    f = self.fehler[f]
+                if zustand:
+                    self.fehler[folge] = kinder[f].get(zeichen, 0)
+                warteschlange.append(folge)
+
+    def finde(self, text):
+        """
+        Fundstellen als [(anfang, ende)], sortiert und ohne Überlappung
+        (frühester Anfang, dann längster Eintrag).
+        """
+        kinder, fehler, laenge, ausgabe = self.kinder, self.fehler, self.laenge, self.ausgabe
+        vergleich = vergleichsform(text)
+        ende_text = len(vergleich)
+
+        laengste = {}   # Anfang -> Ende des längsten ganzen Wortes
+        zustand = 0
+        for i, zeichen in enumerate(vergleich):
+            while zustand and zeichen not in kinder[zustand]:
+                zustand = fehler[zustand]
+            zustand = kinder[zustand].get(zeichen, 0)
+
+            treffer = ausgabe[zustand]
+            # Ein Eintrag kann nur am Wortende enden
+            if not treffer or (i + 1 < ende_text and vergleich[i + 1].isalnum()):
+                continue
+            while treffer:
+                anfang = i + 1 - laenge[treffer]
+                if anfang == 0 or not vergleich[anfang - 1].isalnum():
+                    # spätere Enden sind bei gleichem Anfang immer länger
+                    laengste[anfang] = i + 1
+                treffer = ausgabe[fehler[treffer]]
+
+        fundstellen = []
+        frei_ab = 0
+        for anfang in sorted(laengste):
+            if anfang >= frei_ab:
+                fundstellen.append((anfang, laengste[anfang]))
+                frei_ab = laengste[anfang]
+        return fundstellen
+
+    def markiere(self, text):
+        """Text mit [Klammern] um jede Fundstelle."""
+        teile = []
+        pos = 0
+        for anfang, ende in self.finde(text):
+            teile += [text[pos:anfang], "[", text[anfang:ende], "]"]
+            pos = ende
+        teile.append(text[pos:])
+        return "".join(teile)
+
+
+def markiere(text, automat):
+    """
+    Markiert alle Fundstellen des Automaten im Text; was schon in
+    [Klammern] steht, bleibt unverändert.
+    """
+    teile = zerlege(text)
+    return "".join(
+        automat.markiere(teil) if i % 2 == 0 else f"[{teil.eintrag}]"
+        for i, teil in enumerate(teile)
+    )
+
+
+def anzahl_luecken(text):
+    return len(luecken(zerlege(text)))
@@ -0,0 +1,67 @@
+"""
+Prozess-Pools für Export, Varianten und "Alle erstellen".
+
+Die Pools werden aus Streamlit-Threads gestartet. Mit "fork" (Standard
+unter Linux) könnte ein Arbeitsprozess in dem Moment abgezweigt werden,
+in dem ein anderer Thread gerade eine Sperre hält (z.B. den Vorlagen-
+Cache), und dann für immer darauf warten. Daher starten die Arbeits-
+prozesse über einen Forkserver (ein eigener Prozess ohne Threads, der
+python-docx schon geladen hat), wo es ihn nicht gibt (Windows) mit spawn.
+
+In einem Arbeitsprozess wird kein weiterer Pool gestartet.
+
+gemeinsamer_pool() ist ein Pool pro Server-Prozess, ein Arbeitsprozess
+pro CPU-Kern. Er bleibt offen, damit nicht jeder Klick erst Prozesse
+starten muss.
+"""
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+# Im Forkserver vorab geladen, damit jeder Arbeitsprozess sofort loslegen kann
+VORLADEN = ["docx", "Programme.generatoren"]
+
+if "forkserver" in multiprocessing.get_all_start_methods():
+    KONTEXT = multiprocessing.get_context("forkserver")
+    KONTEXT.set_forkserver_preload(VORLADEN)
+else:
+    KONTEXT = multiprocessing.get_context("spawn")
+
+_im_arbeitsprozess = False
+
+
+def _als_arbeitsprozess():
+    global _im_arbeitsprozess
+    _im_arbeitsprozess = True
+
+
+def pool(max_workers=None):
+    """ProcessPoolExecutor mit sicherer Startmethode (siehe oben)."""
+    if _im_arbeitsprozess:
+        raise RuntimeError("In einem Arbeitsprozess wird kein weiterer Prozess-Pool gestartet")
+    return ProcessPoolExecutor(
+        max_workers=max_workers, mp_context=KONTEXT, initializer=_als_arbeitsprozess
+    )
+
+
+_gemeinsam = None
+_gemeinsam_lock = threading.Lock()
+
+
+def gemeinsamer_pool():
+    """Der langlebige Pool dieses Prozesses (wird beim ersten Aufruf angelegt)."""
+    global _gemeinsam
+    with _gemeinsam_lock:
+        if _gemeinsam is None:
+            _gemeinsam = pool(os.cpu_count() or 1)
+        return _gemeinsam
+
+
+def verwerfen(kaputt):
+    """Nach BrokenProcessPool: beim nächsten gemeinsamer_pool() neu anlegen."""
+    global _gemeinsam
+    with _gemeinsam_lock:
+        if _gemeinsam is kaputt:
+            _gemeinsam = None
+    kaputt.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,133 @@
+"""
+Sprachliche Hilfsfunktionen, die von mehreren Programmen gebraucht werden.
+
+Was die Programme pro Wort brauchen (Suchschlüssel, Form ohne Artikel,
+Form fürs Suchgitter, Unterstrich-Masken, Elision), steht in Wortform und
+wird einmal pro Wort berechnet, danach nur noch nachgeschlagen:
+
+    - schluessel        Suchindex (suche.py)
+    - ohne_artikel      Wortschlange
+    - gitter            Vokabelsuchgitter
+    - maske             Lückentexte, Konjugationen
+    - erster_buchstabe  Lückentexte, Konjugationen
+    - elision           Konjugationen
+
+Vorab berechnet werden sie in den gecachten Ladern von app.py
+(vorbereiten) und beim Aufbau der KonjugationsTabelle.
+"""
+import re
+import unicodedata
+from functools import lru_cache
+from typing import NamedTuple
+
+# Artikel, die z.B. für die Wortschlange ohne Artikel entfernt werden
+ARTIKEL = ["le ", "la ", "l'", "les ", "un ", "une ", "des "]
+
+# Anfangsbuchstaben, vor denen "je" zu "j’" wird
+VOKALE = ("a", "e", "i", "o", "u", "h", "â", "ê", "î", "ô", "û", "é", "è", "ë", "ï")
+
+_APOSTROPHE = str.maketrans({"’": "'", "‘": "'", "‑": "-"})
+_SONDERZEICHEN = re.compile(r"[^\w\s'\-]")
+_LEERZEICHEN = re.compile(r"\s+")
+_VARIANTEN = re.compile(r"\s+/\s+")
+_SATZZEICHEN_ENDE = " !?.…"
+
+
+def ohne_artikel(wort):
+    """Entfernt führende Artikel (wie in der Wortschlange), Groß-/Kleinschreibung egal."""
+    for art in ARTIKEL:
+        if wort.lower().startswith(art):
+            wort = wort[len(art):]
+    return wort
+
+
+def normalisiere(text):
+    """
+    Vergleichsform eines Eintrags: ohne Akzente, kleingeschrieben,
+    einheitliche Apostrophe, ohne Satzzeichen und doppelte Leerzeichen.
+    """
+    text = unicodedata.normalize("NFKD", text.translate(_APOSTROPHE))
+    text = "".join(ch for ch in text if not unicodedata.combining(ch))
+    text = _SONDERZEICHEN.sub(" ", text.casefold())
+    return _LEERZEICHEN.sub(" ", text).strip()
+
+
+def vergleichsform(text):
+    """
+    Kleingeschrieben, einheitliche Apostrophe, Zeichen für Zeichen (gleiche
+    Länge wie text, Stellen im Ergebnis gelten also auch im Original).
+    """
+    klein = text.lower()
+    if len(klein) != len(text):  # z.B. "İ" wird kleingeschrieben zu zwei Zeichen
+        klein = "".join(ch.lower() if len(ch.lower()) == 1 else ch for ch in text)
+    return klein.translate(_APOSTROPHE)
+
+
+def suchschluessel(wort):
+    """Normalisierte Form ohne Artikel, z.B. "l’école" -> "ecole"."""
+    return ohne_artikel(normalisiere(wort))
+
+
+def suchformen(wort):
+    """
+    Formen eines Eintrags, nach denen in Texten gesucht wird (vergleichsform):
+    Varianten wie "Madame / Mme" einzeln, ohne Satzzeichen am Ende, mit und
+    ohne Artikel.
+    """
+    formen = []
+    for teil in _VARIANTEN.split(wort):
+        teil = _LEERZEICHEN.sub(" ", vergleichsform(teil)).strip().rstrip(_SATZZEICHEN_ENDE)
+        for form in (teil, ohne_artikel(teil)):
+            if form and form not in formen:
+                formen.append(form)
+    return formen
+
+
+def unterstrich_maske(form):
+    """Ein "_ " pro Buchstabe, Wörter durch drei Leerzeichen getrennt."""
+    return "   ".join("_ " * len(part) for part in form.split()).strip()
+
+
+def erster_buchstabe_maske(form):
+    """Wie unterstrich_maske(), aber der erste Buchstabe jedes Wortes bleibt stehen."""
+    return "   ".join(
+        (part[0] + " " + "_ " * (len(part) - 1)).strip() for part in form.split()
+    )
+
+
+def elision(form):
+    """True, wenn "je" vor dieser Form zu "j’" wird."""
+    return form.strip().lower()[:1] in VOKALE
+
+
+class Wortform(NamedTuple):
+    schluessel: str         # suchschluessel()
+    ohne_artikel: str       # ohne_artikel()
+    gitter: str             # ohne Leerzeichen, groß (Vokabelsuchgitter)
+    maske: str              # unterstrich_maske()
+    erster_buchstabe: str   # erster_buchstabe_maske()
+    elision: bool           # elision()
+
+
+# Reicht für Wörterbuch, Kapitel und Kontexte; begrenzt, damit ein lange
+# laufender Server nicht mit jedem neuen Wort wächst
+WORTFORMEN_MAX = 32_768
+
+
+@lru_cache(maxsize=WORTFORMEN_MAX)
+def wortform(wort):
+    """Alle abgeleiteten Formen eines Wortes (pro Prozess einmal berechnet)."""
+    return Wortform(
+        schluessel=suchschluessel(wort),
+        ohne_artikel=ohne_artikel(wort),
+        gitter=wort.replace(" ", "").upper(),
+        maske=unterstrich_maske(wort),
+        erster_buchstabe=erster_buchstabe_maske(wort),
+        elision=elision(wort),
+    )
+
+
+def vorbereiten(woerter):
+    """Berechnet die Wortformen vorab (beim Laden), die Generatoren schlagen sie nur nach."""
+    for wort in woerter:
+        wortform(wort)
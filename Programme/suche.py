@@ -0,0 +1,294 @@
+"""
+Vorab gebauter Suchindex über das Wörterbuch.
+
+Statt bei jedem Klick alle Einträge kleinzuschreiben und zu durchsuchen,
+wird einmal ein n-Gramm-Index (1- bis 3-Gramme) und ein sortierter
+Präfix-Index aufgebaut. Eine Suche liefert die besten k Treffer:
+
+    1. exakter Treffer (ganzer Eintrag oder Eintrag ohne Artikel)
+    2. Eintrag beginnt mit dem Suchbegriff
+    3. ein Wort im Eintrag beginnt mit dem Suchbegriff
+    4. Suchbegriff kommt irgendwo im Eintrag vor
+
+    5. nur wenn nichts gefunden wurde: unscharfer Treffer (Tippfehler)
+       über einen BK-Baum
+
+Innerhalb einer Stufe gewinnen kürzere Einträge. Verglichen wird immer
+die normalisierte Form (ohne Akzente, Artikel zählen für Präfixe nicht),
+"ecole" findet also "l’école" und "maniere" findet "la manière".
+"""
+import re
+import heapq
+from bisect import bisect_left
+from collections import defaultdict
+
+from Programme.sprache import normalisiere, ohne_artikel, wortform
+
+MAX_N = 3
+
+_TOKEN_SPLIT = re.compile(r"[\s'’\-]+")
+
+
+def _ngrams(text, n):
+    return {text[i:i + n] for i in range(len(text) - n + 1)}
+
+
+def damerau_levenshtein(a, b, limit=None):
+    """
+    Editierdistanz, vertauschte Buchstaben zählen als ein Fehler ("chta" ->
+    "chat" = 1). Anders als die eingeschränkte Variante (OSA) erfüllt sie
+    die Dreiecksungleichung, taugt also als Maß für den BK-Baum.
+    Mit limit wird abgebrochen, sobald die Distanz sicher größer als limit
+    ist; dann wird limit + 1 zurückgegeben.
+
+    >>> damerau_levenshtein("chta", "chat")
+    1
+    >>> damerau_levenshtein("ca", "abc")
+    2
+    """
+    la, lb = len(a), len(b)
+    if limit is not None and abs(la - lb) > limit:
+        return limit + 1
+    if not la or not lb:
+        return la + lb
+
+    unendlich = la + lb
+    # zeilen[i + 1][j + 1] = Distanz von a[:i] zu b[:j], mit Rand aus "unendlich"
+    zeilen = [[unendlich] * (lb + 2), [unendlich] + list(range(lb + 1))]
+    zuletzt = {}    # Buchstabe -> letzte Zeile in a, in der er vorkam
+    # Untergrenze für Wege, die über die aktuelle Zeile hinwegspringen
+    # (eine Vertauschung aus Zeile m kostet mindestens i - m)
+    ueber = 1
+    for i in range(1, la + 1):
+        ai = a[i - 1]
+        vorher = zeilen[i]
+        zeile = [unendlich, i] + [0] * lb
+        letzte_spalte = 0   # letzte Spalte j mit b[j - 1] == ai
+        zeile_min = i
+        for j in range(1, lb + 1):
+            bj = b[j - 1]
+            if ai == bj:
+                wert = vorher[j]
+                letzte_spalte = j
+            else:
+                # ersetzen, einfügen, löschen (ohne min(), das ist die innerste Schleife)
+                wert = vorher[j]
+                if zeile[j] < wert:
+                    wert = zeile[j]
+                if vorher[j + 1] < wert:
+                    wert = vorher[j + 1]
+                wert += 1
+                k = zuletzt.get(bj, 0)
+                if k and letzte_spalte:
+                    # a[k-1] == b[j-1] und a[i-1] == b[l-1]: vertauschen, dazwischen löschen/einfügen
+                    vertauscht = zeilen[k][letzte_spalte] + (i - k) + (j - letzte_spalte - 1)
+                    if vertauscht < wert:
+                        wert = vertauscht
+            zeile[j + 1] = wert
+            if wert < zeile_min:
+                zeile_min = wert
+        zeilen.append(zeile)
+        zuletzt[ai] = i
+        if limit is not None and min(zeile_min, ueber) > limit:
+            return limit + 1
+        ueber = min(ueber, zeile_min) + 1
+    return zeilen[la + 1][lb + 1]
+
+
+def max_distanz(query):
+    """Erlaubte Tippfehler je nach Länge des Suchbegriffs."""
+    if len(query) < 3:
+        return 0
+    if len(query) < 5:
+        return 1
+    return 2
+
+
+class BKBaum:
+    """
+    Burkhard-Keller-Baum über Schlüssel mit der Damerau-Levenshtein-Distanz.
+    Eine Suche mit Radius r besucht nur Teilbäume, deren Kantenabstand
+    im Intervall [d - r, d + r] liegt (Dreiecksungleichung).
+    """
+
+    def __init__(self):
+        self._root = None
+        self._size = 0
+
+    def __len__(self):
+        return self._size
+
+    def add(self, key, value):
+        if self._root is None:
+            self._root = (key, [value], {})
+            self._size = 1
+            return
+        node = self._root
+        while True:
+            d = damerau_levenshtein(key, node[0])
+            if d == 0:
+                node[1].append(value)
+                return
+            child = node[2].get(d)
+            if child is None:
+                node[2][d] = (key, [value], {})
+                self._size += 1
+                return
+            node = child
+
+    def search(self, key, radius):
+        """Liefert (distanz, wert) für alle Schlüssel mit Distanz <= radius."""
+        if self._root is None:
+            return []
+        result = []
+        stack = [self._root]
+        while stack:
+            node_key, values, children = stack.pop()
+            # Die genaue Distanz wird nur bis zur größten Kante + radius gebraucht
+            limit = radius + max(children, default=0)
+            d = damerau_levenshtein(key, node_key, limit)
+            if d <= radius:
+                result.extend((d, v) for v in values)
+            for edge, child in children.items():
+                if d - radius <= edge <= d + radius:
+                    stack.append(child)
+        return result
+
+
+class SuchIndex:
+    # Bei Änderungen am Aufbau erhöhen (gespeicherte Indizes in der Ablage veralten)
+    VERSION = 3
+
+    def __init__(self, entries):
+        self.entries = [e for e in entries if "word" in e]
+        self.keys = [normalisiere(e["word"]) for e in self.entries]
+        self.stems = [wortform(e["word"]).schluessel for e in self.entries]
+
+        # Rang innerhalb einer Stufe: kürzere Einträge zuerst, dann alphabetisch
+        order = sorted(range(len(self.keys)), key=lambda i: (len(self.keys[i]), self.keys[i]))
+        self._rank = [0] * len(order)
+        for rank, i in enumerate(order):
+            self._rank[i] = rank
+
+        # Exakte Treffer: ganzer Eintrag oder Eintrag ohne Artikel -> Eintrags-IDs
+        exact = defaultdict(set)
+        for i, (key, stem) in enumerate(zip(self.keys, self.stems)):
+            exact[key].add(i)
+            exact[stem].add(i)
+        self._exact = dict(exact)
+
+        # n-Gramm -> sortierte Liste von Eintrags-IDs
+        postings = defaultdict(list)
+        for i, key in enumerate(self.keys):
+            grams = set()
+            for n in range(1, MAX_N + 1):
+                grams |= _ngrams(key, n)
+            for g in grams:
+                postings[g].append(i)
+        self._postings = dict(postings)
+
+        # Präfix-Indizes: ganze Einträge (mit und ohne Artikel) und einzelne Wörter
+        self._prefix = sorted(
+            {(key, i) for i, key in enumerate(self.keys)}
+            | {(stem, i) for i, stem in enumerate(self.stems)}
+        )
+        self._token_prefix = sorted(
+            (token, i)
+            for i, key in enumerate(self.keys)
+            for token in _TOKEN_SPLIT.split(key)
+            if token
+        )
+
+        # Unscharfe Suche über die Einträge ohne Artikel
+        self._bk = BKBaum()
+        for i, stem in enumerate(self.stems):
+            if stem:
+                self._bk.add(stem, i)
+
+    def __len__(self):
+        return len(self.entries)
+
+    # --------------------------------------------------
+    # Kandidaten je Stufe
+    # --------------------------------------------------
+    @staticmethod
+    def _prefix_range(sorted_pairs, query):
+        start = bisect_left(sorted_pairs, (query,))
+        for j in range(start, len(sorted_pairs)):
+            key, i = sorted_pairs[j]
+            if not key.startswith(query):
+                break
+            yield i
+
+    def _substring_ids(self, query):
+        if len(query) <= MAX_N:
+            return self._postings.get(query, [])
+
+        # Schnittmenge der Trigramm-Listen, kleinste zuerst
+        lists = sorted(
+            (self._postings.get(g, []) for g in _ngrams(query, MAX_N)),
+            key=len
+        )
+        if not lists[0]:
+            return []
+        candidates = set(lists[0])
+        for ids in lists[1:]:
+            candidates.intersection_update(ids)
+            if not candidates:
+                return []
+        return [i for i in candidates if query in self.keys[i]]
+
+    # --------------------------------------------------
+    # Suche
+    # --------------------------------------------------
+    def _fuzzy_ids(self, query):
+        stem = ohne_artikel(query)
+        hits = self._bk.search(stem, max_distanz(stem))
+        hits.sort(key=lambda hit: (hit[0], self._rank[hit[1]]))
+        return [i for _, i in hits]
+
+    def search(self, query, k=20, fuzzy=True):
+        """
+        Die besten k Einträge (dicts wie im Wörterbuch) für den Suchbegriff.
+
+        >>> index = SuchIndex([{"word": "le chat"}, {"word": "chatter"}, {"word": "le château"}])
+        >>> [e["word"] for e in index.search("chat")]
+        ['le chat', 'chatter', 'le château']
+        >>> [e["word"] for e in index.search("chta")]   # vertauschte Buchstaben
+        ['le chat']
+        """
+        query = normalisiere(query)
+        if not query or k <= 0:
+            return []
+
+        tiers = (
+            lambda: self._exact.get(query, ()),
+            lambda: self._prefix_range(self._prefix, query),
+            lambda: self._prefix_range(self._token_prefix, query),
+            lambda: self._substring_ids(query),
+        )
+
+        result = []
+        seen_ids = set()
+        seen_words = set()
+
+        def take(ids):
+            for i in ids:
+                word = self.entries[i]["word"]
+                if i in seen_ids or word in seen_words:
+                    continue
+                seen_ids.add(i)
+                seen_words.add(word)
+                result.append(i)
+                if len(result) >= k:
+                    return True
+            return False
+
+        for tier in tiers:
+            ids = [i for i in set(tier()) if i not in seen_ids]
+            # Doppelte Wörter im Wörterbuch überspringen, daher etwas Reserve
+            if take(heapq.nsmallest(2 * k, ids, key=self._rank.__getitem__)):
+                break
+        if fuzzy and not result:
+            take(self._fuzzy_ids(query))
+        return [self.entries[i] for i in result]
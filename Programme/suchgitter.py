@@ -0,0 +1,235 @@
+"""
+Platzierung der Wörter im Vokabelsuchgitter.
+
+Bisher wurde jedes Wort bis zu 200-mal an eine zufällige Stelle gelegt
+und bei Misserfolg stillschweigend weggelassen. Hier wird stattdessen
+systematisch gesucht (Backtracking):
+
+    - längste Wörter zuerst, gleich lange in zufälliger Reihenfolge
+    - alle möglichen Lagen eines Wortes werden in einem Durchgang mit NumPy
+      bestimmt, statt jede Lage Buchstabe für Buchstabe in Python zu
+      prüfen: für jede Richtung und jedes Anfangsfeld werden die Felder
+      unter dem Wort auf einmal gelesen (gleitendes Fenster) und mit dem
+      Wort verglichen; dabei fällt auch ab, wie viele liegende Buchstaben
+      eine Lage kreuzt
+    - passt ein Wort nirgends, wird das vorige Wort verschoben
+
+Entweder liegen danach alle Wörter im Gitter, oder es ist bewiesen, dass
+es keine Lösung gibt (KeinPlatz). Die Suche ist durch ein Budget an
+geprüften Lagen begrenzt; ist es aufgebraucht, gilt das Gitter ebenfalls
+als zu klein. Mit groesse=None wird das Gitter ab MIN_GROESSE so lange
+vergrößert, bis alles passt. Für lange Wortlisten verteilt verteile()
+die Wörter stattdessen auf mehrere Gitter (Seiten) mit etwa gleich
+vielen Buchstaben.
+
+Das Gitter ist ein flaches uint32-Array mit den Unicode-Codes der
+Buchstaben (0 = frei) und einem Rand aus RAND-Feldern, so dass Fenster,
+die über das Gitter hinausragen, von selbst nicht passen. Eine Richtung
+ist ein Schritt (dz, ds) pro Buchstabe.
+"""
+import heapq
+import math
+import random
+
+import numpy as np
+
+# Standardgröße wie bisher (20×20), größer wird es nur bei Bedarf
+MIN_GROESSE = 20
+MAX_GROESSE = 40
+# Platzierungsversuche pro Gittergröße (etwa eine Sekunde)
+MAX_KNOTEN = 2_000
+# Startgröße: Anteil der Felder, den die Buchstaben höchstens füllen
+FUELLGRAD = 0.7
+# Ab diesem Füllgrad werden Kreuzungen zuerst probiert (vorher verteilen
+# sich die Wörter sonst alle um das erste)
+KREUZEN_AB = 0.3
+
+WAAGERECHT = (0, 1)
+SENKRECHT = (1, 0)
+DIAGONAL_AB = (1, 1)
+DIAGONAL_AUF = (-1, 1)
+
+# Feld außerhalb des Gitters (passt zu keinem Buchstaben)
+RAND = np.iinfo(np.uint32).max
+
+
+class KeinPlatz(ValueError):
+    """Die Wörter passen nicht ins Gitter."""
+
+    def __init__(self, groesse, bewiesen):
+        self.groesse = groesse
+        # False: Knotenbudget aufgebraucht, eine Lösung ist nicht ausgeschlossen
+        self.bewiesen = bewiesen
+        grund = "passen nicht" if bewiesen else "passen nicht im Knotenbudget"
+        super().__init__(f"Die Wörter {grund} in ein {groesse}×{groesse}-Gitter")
+
+    def __reduce__(self):
+        # Für den Weg aus einem Arbeitsprozess (Varianten, "Alle erstellen")
+        return KeinPlatz, (self.groesse, self.bewiesen)
+
+
+def richtungen(diagonal=False, rueckwaerts=False):
+    """Erlaubte Richtungen: immer waagerecht und senkrecht, optional mehr."""
+    liste = [WAAGERECHT, SENKRECHT]
+    if diagonal:
+        liste += [DIAGONAL_AB, DIAGONAL_AUF]
+    if rueckwaerts:
+        liste += [(-dz, -ds) for dz, ds in liste]
+    return liste
+
+
+class _Suche:
+    def __init__(self, woerter, groesse, richtungen, rng, max_knoten):
+        # Codes als Spalte, damit sie gegen [Buchstabe, Richtung, Anfangsfeld] vergleichen
+        self.woerter = [np.array([ord(b) for b in w], dtype=np.uint32)[:, None, None] for w in woerter]
+        self.groesse = groesse
+        self.richtungen = richtungen
+        # Reihenfolge gleich guter Lagen, aus dem rng abgeleitet (Seed bleibt gültig)
+        self.zufall = np.random.default_rng(rng.getrandbits(64))
+        self.knoten = max_knoten
+        self.benutzt = set()
+
+        # Rand so breit wie das längste Wort, innen das eigentliche Gitter
+        # (ohne Wörter bleibt das Gitter leer)
+        rand = max((len(w) for w in woerter), default=1) - 1
+        breite = groesse + 2 * rand
+        self.feld = np.full((breite, breite), RAND, dtype=np.uint32)
+        self.innen = self.feld[rand:rand + groesse, rand:rand + groesse]
+        self.innen[:] = 0
+        self.feld = self.feld.reshape(-1)  # Sicht auf dieselben Daten
+        zeilen, spalten = np.divmod(np.arange(groesse * groesse), groesse)
+        self.anker = (zeilen + rand) * breite + spalten + rand
+        self.schritte = np.array([dz * breite + ds for dz, ds in richtungen])
+        self._fenster = {}
+
+    def fenster(self, laenge):
+        """
+        Feldnummern unter dem Wort: [Buchstabe, Richtung, Anfangsfeld] (pro Länge
+        einmal). Der Buchstabe steht vorne, damit über ihn zusammengefasst wird.
+        """
+        if laenge not in self._fenster:
+            self._fenster[laenge] = (
+                self.anker[None, None, :]
+                + self.schritte[None, :, None] * np.arange(laenge)[:, None, None]
+            )
+        return self._fenster[laenge]
+
+    def kandidaten(self, codes):
+        """
+        Alle Lagen (Richtung, Anfangsfeld), in die das Wort passt: bei leerem
+        Gitter in zufälliger Reihenfolge, ab KREUZEN_AB die mit den meisten
+        Kreuzungen zuerst.
+        """
+        unter = self.feld[self.fenster(len(codes))]
+        gleich = unter == codes
+        richtungen, anker = np.nonzero((gleich | (unter == 0)).all(axis=0))
+
+        reihenfolge = self.zufall.permutation(len(anker))
+        if np.count_nonzero(self.innen) >= KREUZEN_AB * self.innen.size:
+            kreuzt = gleich[:, richtungen, anker].sum(axis=0)
+            reihenfolge = reihenfolge[np.argsort(-kreuzt[reihenfolge], kind="stable")]
+        return richtungen[reihenfolge].tolist(), anker[reihenfolge].tolist()
+
+    def suche(self, nr, lagen):
+        """True, wenn die Wörter ab nr alle platziert werden konnten."""
+        if nr == len(self.woerter):
+            return True
+        codes = self.woerter[nr]
+        schluessel = codes.tobytes()
+        for richtung, anker in zip(*self.kandidaten(codes)):
+            # Gleiches Wort nicht zweimal an dieselbe Stelle
+            if (schluessel, richtung, anker) in self.benutzt:
+                continue
+            self.knoten -= 1
+            if self.knoten < 0:
+                raise KeinPlatz(self.groesse, bewiesen=False)
+
+            felder = self.fenster(len(codes))[:, richtung, anker]
+            neu = felder[self.feld[felder] == 0]
+            self.feld[felder] = codes[:, 0, 0]
+            self.benutzt.add((schluessel, richtung, anker))
+            lagen.append(divmod(anker, self.groesse) + (self.richtungen[richtung],))
+            if self.suche(nr + 1, lagen):
+                return True
+            lagen.pop()
+            self.benutzt.discard((schluessel, richtung, anker))
+            self.feld[neu] = 0
+        return False
+
+
+def platziere(woerter, groesse, richtungen=(WAAGERECHT, SENKRECHT), rng=random, max_knoten=MAX_KNOTEN):
+    """
+    Legt alle Wörter (so wie sie ins Gitter sollen, z.B. in Großbuchstaben)
+    in ein groesse×groesse-Gitter.
+
+    Rückgabe: (gitter, lagen)
+        gitter: Liste von Zeilen, freie Felder sind ""
+        lagen:  je Wort (zeile, spalte, (dz, ds)) in der Reihenfolge von woerter
+    Wirft KeinPlatz, wenn es keine Lösung gibt oder das Knotenbudget nicht reicht.
+    """
+    if any(len(w) > groesse for w in woerter):
+        raise KeinPlatz(groesse, bewiesen=True)
+
+    # Schwierige (lange) Wörter zuerst; leere Wörter brauchen keinen Platz
+    reihenfolge = [i for i, w in enumerate(woerter) if w]
+    rng.shuffle(reihenfolge)
+    reihenfolge.sort(key=lambda i: -len(woerter[i]))
+
+    suche = _Suche([woerter[i] for i in reihenfolge], groesse, list(richtungen), rng, max_knoten)
+    gefundene = []
+    if not suche.suche(0, gefundene):
+        raise KeinPlatz(groesse, bewiesen=True)
+
+    lagen = [None] * len(woerter)
+    for i, lage in zip(reihenfolge, gefundene):
+        lagen[i] = lage
+    gitter = [[chr(code) if code else "" for code in zeile] for zeile in suche.innen.tolist()]
+    return gitter, lagen
+
+
+def startgroesse(woerter):
+    """Längstes Wort, und die Buchstaben füllen höchstens FUELLGRAD des Gitters."""
+    laengen = [len(w) for w in woerter]
+    return max(max(laengen, default=1), math.ceil(math.sqrt(sum(laengen) / FUELLGRAD)))
+
+
+def baue_gitter(woerter, groesse=None, richtungen=(WAAGERECHT, SENKRECHT), rng=random,
+                min_groesse=MIN_GROESSE, max_groesse=MAX_GROESSE, max_knoten=MAX_KNOTEN):
+    """
+    Wie platziere(), aber mit groesse=None wird das Gitter so lange
+    vergrößert (ab min_groesse bzw. startgroesse(), bis max_groesse), bis
+    alles passt. Die Laufzeit ist durch die Zahl der Größen × max_knoten begrenzt.
+
+    Rückgabe: (groesse, gitter, lagen)
+    """
+    if groesse is not None:
+        return (groesse,) + platziere(woerter, groesse, richtungen, rng, max_knoten)
+
+    groesse = max(min_groesse, startgroesse(woerter))
+    while True:
+        try:
+            return (groesse,) + platziere(woerter, groesse, richtungen, rng, max_knoten)
+        except KeinPlatz:
+            if groesse >= max_groesse:
+                raise
+            groesse += 1
+
+
+def seitenzahl(woerter, groesse=MIN_GROESSE):
+    """Seiten, damit die Buchstaben jedes groesse×groesse-Gitter höchstens zu FUELLGRAD füllen."""
+    buchstaben = sum(len(w) for w in woerter)
+    return max(1, math.ceil(buchstaben / (FUELLGRAD * groesse * groesse)))
+
+
+def verteile(woerter, seiten):
+    """
+    Nummern der Wörter je Seite, mit möglichst gleich vielen Buchstaben
+    pro Seite: das längste noch offene Wort kommt auf die leerste Seite.
+    """
+    leerste = [(0, seite) for seite in range(seiten)]
+    verteilung = [[] for _ in range(seiten)]
+    for nr in sorted(range(len(woerter)), key=lambda nr: -len(woerter[nr])):
+        buchstaben, seite = heapq.heappop(leerste)
+        verteilung[seite].append(nr)
+        heapq.heappush(leerste, (buchstaben + len(woerter[nr]), seite))
+    return verteilung
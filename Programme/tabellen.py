@@ -0,0 +1,224 @@
+"""
+Tabellen in einem Durchgang bauen.
+
+Statt eine Tabelle Zeile für Zeile mit add_row() aufzubauen (python-docx
+läuft bei jedem .rows/.cells erneut über die ganze Tabelle) und danach
+an jede Zeile ein w:trHeight zu hängen, wird das komplette w:tbl-XML
+einmal als Text erzeugt und am Stück ins Dokument eingefügt:
+Kopfzeile, Zeilenhöhen, Spaltenbreiten und Schrift inklusive.
+
+    baue_tabelle(doc, zeilen, kopfzeile=["Wort", "Übersetzung"],
+                 zeilenhoehe_cm=1, kopf_format=Zellformat(fett=True))
+
+tabelle_xml() liefert dasselbe XML stückweise (eine Zeile pro Stück),
+z.B. für Dokumente, die direkt als XML geschrieben werden.
+
+Für große Tabellen mit immer gleicher Schrift (Buchstabengitter) kann
+statt Schriftart/-größe an jedem Run eine gemeinsame Zeichenformatvorlage
+verwendet werden (zeichenformat()).
+"""
+from xml.sax.saxutils import escape
+
+from docx.enum.style import WD_STYLE_TYPE
+from docx.oxml import parse_xml
+from docx.oxml.ns import nsdecls
+from docx.shared import Length, Pt
+from docx.styles import BabelFish
+from docx.table import Table
+
+# Zeilenhöhe wie bisher in set_zeilenhoehe: 1 cm = 567 twips
+TWIPS_PRO_CM = 567
+
+
+class Zellformat:
+    """
+    Absatz- und Schriftformat einer Zelle, einmal in XML übersetzt und
+    dann für jede Zelle wiederverwendet.
+    """
+    __slots__ = ("ppr", "rpr")
+
+    def __init__(self, fett=False, groesse=None, schrift=None, ausrichtung=None,
+                 zeichenformat=None):
+        self.ppr = '<w:jc w:val="%s"/>' % ausrichtung if ausrichtung else ""
+
+        rpr = ""
+        if zeichenformat:
+            rpr += '<w:rStyle w:val="%s"/>' % escape(zeichenformat, {'"': "&quot;"})
+        if schrift:
+            name = escape(schrift, {'"': "&quot;"})
+            rpr += '<w:rFonts w:ascii="%s" w:hAnsi="%s" w:eastAsia="%s"/>' % (name, name, name)
+        if fett:
+            rpr += "<w:b/>"
+        if groesse:
+            rpr += '<w:sz w:val="%d"/>' % round(groesse * 2)  # halbe Punkte
+        self.rpr = "<w:rPr>%s</w:rPr>" % rpr if rpr else ""
+
+
+OHNE_FORMAT = Zellformat()
+
+
+def text_xml(text):
+    """Text eines Runs; Zeilenumbrüche und Tabs wie bei run.text."""
+    teile = []
+    for i, zeile in enumerate(text.split("\n")):
+        if i:
+            teile.append("<w:br/>")
+        for j, stueck in enumerate(zeile.split("\t")):
+            if j:
+                teile.append("<w:tab/>")
+            if not stueck:
+                continue
+            if stueck != stueck.strip():
+                teile.append('<w:t xml:space="preserve">%s</w:t>' % escape(stueck))
+            else:
+                teile.append("<w:t>%s</w:t>" % escape(stueck))
+    return "".join(teile)
+
+
+def _zelle_xml(text, breite, fmt):
+    if text:
+        # Leere Zellen bekommen keinen Run, das Format sitzt dann an der Absatzmarke
+        inhalt = "<w:r>%s%s</w:r>" % (fmt.rpr, text_xml(text))
+        ppr = fmt.ppr
+    else:
+        inhalt = ""
+        ppr = fmt.ppr + fmt.rpr
+    ppr = "<w:pPr>%s</w:pPr>" % ppr if ppr else ""
+    return (
+        '<w:tc><w:tcPr><w:tcW w:type="dxa" w:w="%d"/></w:tcPr><w:p>%s%s</w:p></w:tc>'
+        % (breite, ppr, inhalt)
+    )
+
+
+def _formate(fmt, spalten):
+    if fmt is None:
+        return [OHNE_FORMAT] * spalten
+    if isinstance(fmt, Zellformat):
+        return [fmt] * spalten
+    return [f or OHNE_FORMAT for f in fmt]
+
+
+def tabelle_xml(zeilen, spaltenbreiten, kopfzeile=None, style_id=None,
+                zeilenhoehe_cm=None, ausrichtung=None, autofit=True,
+                kopf_format=None, zellen_format=None, namespaces=False):
+    """
+    Erzeugt das w:tbl-XML stückweise.
+
+    zeilen:         Liste von Zeilen, jede Zeile eine Liste von Texten
+    spaltenbreiten: Breite je Spalte in twips
+    kopfzeile:      Texte der Kopfzeile (optional)
+    style_id:       Tabellen-Formatvorlage als Style-ID (z.B. "Tabellenraster")
+    zeilenhoehe_cm: Mindesthöhe jeder Zeile (auch der Kopfzeile)
+    ausrichtung:    Ausrichtung der Tabelle auf der Seite, z.B. "center"
+    kopf_format / zellen_format: ein Zellformat oder eine Liste je Spalte
+    namespaces:     w-Namespace am w:tbl deklarieren (für parse_xml)
+    """
+    spalten = len(spaltenbreiten)
+    kopf_formate = _formate(kopf_format, spalten)
+    zellen_formate = _formate(zellen_format, spalten)
+
+    tblpr = ""
+    if style_id:
+        tblpr += '<w:tblStyle w:val="%s"/>' % escape(style_id, {'"': "&quot;"})
+    tblpr += '<w:tblW w:type="auto" w:w="0"/>'
+    if ausrichtung:
+        tblpr += '<w:jc w:val="%s"/>' % ausrichtung
+    if not autofit:
+        tblpr += '<w:tblLayout w:type="fixed"/>'
+    tblpr += (
+        '<w:tblLook w:firstColumn="1" w:firstRow="1" w:lastColumn="0" '
+        'w:lastRow="0" w:noHBand="0" w:noVBand="1" w:val="04A0"/>'
+    )
+
+    yield "<w:tbl%s><w:tblPr>%s</w:tblPr><w:tblGrid>%s</w:tblGrid>" % (
+        " " + nsdecls("w") if namespaces else "",
+        tblpr,
+        "".join('<w:gridCol w:w="%d"/>' % b for b in spaltenbreiten),
+    )
+
+    if zeilenhoehe_cm is not None:
+        tr_start = '<w:tr><w:trPr><w:trHeight w:val="%d" w:hRule="atLeast"/></w:trPr>' % int(
+            zeilenhoehe_cm * TWIPS_PRO_CM
+        )
+    else:
+        tr_start = "<w:tr>"
+
+    def zeile_xml(texte, formate):
+        texte = list(texte)
+        texte += [""] * (spalten - len(texte))
+        return tr_start + "".join(
+            _zelle_xml(text, breite, fmt)
+            for text, breite, fmt in zip(texte, spaltenbreiten, formate)
+        ) + "</w:tr>"
+
+    if kopfzeile is not None:
+        yield zeile_xml(kopfzeile, kopf_formate)
+    for zeile in zeilen:
+        yield zeile_xml(zeile, zellen_formate)
+
+    yield "</w:tbl>"
+
+
+def style_id(doc, name):
+    """Style-ID einer Formatvorlage, angegeben per Name (wie in Word) oder ID."""
+    styles = doc.styles.element
+    style = styles.get_by_name(BabelFish.ui2internal(name))
+    if style is None:
+        style = styles.get_by_id(name)
+    if style is None:
+        raise KeyError("Keine Formatvorlage '%s' in der Vorlage" % name)
+    return style.styleId
+
+
+def zeichenformat(doc, name, schrift=None, groesse=None):
+    """
+    Legt eine Zeichenformatvorlage an (falls noch nicht vorhanden) und gibt
+    ihre Style-ID zurück, z.B. für Zellformat(zeichenformat=...).
+    """
+    style = doc.styles.element.get_by_name(name)
+    if style is None:
+        neu = doc.styles.add_style(name, WD_STYLE_TYPE.CHARACTER)
+        if schrift:
+            neu.font.name = schrift
+        if groesse:
+            neu.font.size = Pt(groesse)
+        style = neu.element
+    return style.styleId
+
+
+def breiten_twips(blockbreite, spalten, breiten=None):
+    """
+    Breiten in twips; ohne Angabe wie add_table gleichmäßig über die
+    Seite (blockbreite: Seitenbreite ohne Ränder in EMU).
+    """
+    if breiten is not None:
+        return [Length(b).twips for b in breiten]
+    return [Length(int(blockbreite / spalten)).twips] * spalten
+
+
+def baue_tabelle(doc, zeilen, kopfzeile=None, spalten=None, style="Table Grid",
+                 breiten=None, **optionen):
+    """
+    Hängt eine fertige Tabelle an das Dokument an und gibt sie zurück.
+
+    spalten: Anzahl der Spalten (Standard: Länge der Kopfzeile)
+    style:   Name oder ID der Formatvorlage, None für keine
+    breiten: Spaltenbreiten als Längen (z.B. Cm(3)); fest, wenn angegeben
+    Weitere Optionen wie bei tabelle_xml().
+    """
+    if spalten is None:
+        spalten = len(kopfzeile) if kopfzeile is not None else len(zeilen[0])
+    if breiten is not None:
+        optionen.setdefault("autofit", False)
+
+    xml = "".join(tabelle_xml(
+        zeilen,
+        breiten_twips(doc._block_width, spalten, breiten),
+        kopfzeile=kopfzeile,
+        style_id=style_id(doc, style) if style else None,
+        namespaces=True,
+        **optionen
+    ))
+    tbl = parse_xml(xml)
+    doc.element.body._insert_tbl(tbl)
+    return Table(tbl, doc._body)
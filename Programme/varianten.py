@@ -0,0 +1,111 @@
+"""
+Mehrere Varianten eines Arbeitsblatts (Gruppen A, B, C …) aus einer Wortliste.
+
+Jede Variante hat ihren eigenen Seed und wird parallel in einem
+Prozess-Pool erzeugt. Gleiche Eingabe + gleicher Seed ergeben dieselbe
+.docx-Datei (Byte für Byte), ein Nachdruck braucht also nur den Seed.
+
+    seeds = varianten_seeds(4711, 3)        # [4711, 4712, 4713]
+    docs = erstelle_varianten("Vokabelrätsel", seeds, paare, template_path)
+    zusammenfuegen(docs)                    # ein Dokument, Gruppe für Gruppe
+    als_zip("Vokabelrätsel", docs)          # eine Datei pro Gruppe
+
+Programme mit Seed: SEED_PROGRAMME.
+"""
+import string
+import zipfile
+from io import BytesIO
+
+from docx import Document
+from docx.oxml.ns import qn
+
+from Programme import generatoren, prozesse
+from Programme.dokument import FESTE_ZEIT, speichere
+from Programme.generatoren import SEED_PROGRAMME
+
+MAX_VARIANTEN = len(string.ascii_uppercase)
+
+
+def varianten_seeds(basis_seed, anzahl):
+    return [basis_seed + i for i in range(anzahl)]
+
+
+def gruppe(index):
+    """0 -> "A", 1 -> "B", …"""
+    return string.ascii_uppercase[index]
+
+
+def _erstelle_variante(program, seed, args, kwargs):
+    return generatoren.erstelle(program, *args, seed=seed, **kwargs).getvalue()
+
+
+def erstelle_varianten(program, seeds, *args, max_workers=None, **kwargs):
+    """
+    Ruft das Programm einmal pro Seed auf (parallel) und liefert
+    [(Seed, .docx-Bytes)] in der Reihenfolge der Seeds.
+    Weitere Argumente werden unverändert an das Programm weitergegeben.
+    """
+    if program not in SEED_PROGRAMME:
+        raise ValueError(f"{program} kann keine Varianten erzeugen")
+    if not 1 <= len(seeds) <= MAX_VARIANTEN:
+        raise ValueError(f"1 bis {MAX_VARIANTEN} Varianten möglich")
+
+    if len(seeds) == 1:
+        return [(seeds[0], _erstelle_variante(program, seeds[0], args, kwargs))]
+
+    with prozesse.pool(min(len(seeds), max_workers or len(seeds))) as pool:
+        docs = pool.map(
+            _erstelle_variante,
+            [program] * len(seeds), seeds, [args] * len(seeds), [kwargs] * len(seeds)
+        )
+        return list(zip(seeds, docs))
+
+
+def dateiname(program, index, seed):
+    return f"{program}_Gruppe_{gruppe(index)}_{seed}.docx"
+
+
+def als_zip(program, varianten):
+    """Eine .docx pro Gruppe in einer ZIP-Datei (feste Namen und Zeitstempel)."""
+    ziel = BytesIO()
+    with zipfile.ZipFile(ziel, "w", zipfile.ZIP_STORED) as zf:
+        for index, (seed, daten) in enumerate(varianten):
+            info = zipfile.ZipInfo(dateiname(program, index, seed), FESTE_ZEIT)
+            info.create_system = 0
+            zf.writestr(info, daten)
+    ziel.seek(0)
+    return ziel
+
+
+def _anhaengen(body, element):
+    sect_pr = body.sectPr
+    if sect_pr is None:
+        body.append(element)
+    else:
+        sect_pr.addprevious(element)
+
+
+def zusammenfuegen(varianten):
+    """
+    Alle Varianten hintereinander in einem Dokument, jede Gruppe beginnt
+    auf einer neuen Seite mit "Gruppe X (Seed …)". Formatvorlagen, Kopf-
+    und Fußzeilen kommen aus der ersten Variante (alle nutzen dieselbe Vorlage).
+    """
+    teile = [Document(BytesIO(daten)) for _, daten in varianten]
+    doc = teile[0]
+    body = doc.element.body
+    inhalte = [
+        [el for el in teil.element.body if el.tag != qn("w:sectPr")]
+        for teil in teile
+    ]
+    for element in inhalte[0]:
+        body.remove(element)
+
+    for index, ((seed, _), inhalt) in enumerate(zip(varianten, inhalte)):
+        if index:
+            doc.add_page_break()
+        doc.add_paragraph(f"Gruppe {gruppe(index)} (Seed {seed})")
+        for element in inhalt:
+            _anhaengen(body, element)
+
+    return speichere(doc)
@@ -0,0 +1,591 @@
+"""
+Kompiliert alle Vokabel-, Kontext-, Lernstand- und Verbdateien in eine
+indizierte SQLite-Datenbank und stellt die Abfragen für app.py bereit.
+
+Build-Schritt (z.B. nach dem Einspielen neuer JSON-Dateien):
+
+    python -m Programme.vokabel_db
+"""
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+
+from Programme.dateicache import list_dirs, list_json_files, load_json_mit_hash, signatur
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DB_PATH = os.path.join(BASE_DIR, "vokabeln.db")
+
+DICTIONARY_DIR = "vocabs_all"
+
+# Bei Änderungen am Schema erhöhen, alte Datenbanken werden dann neu gebaut
+SCHEMA_VERSION = 3
+
+SCHEMA = f"""
+PRAGMA user_version = {SCHEMA_VERSION};
+CREATE TABLE sources (
+    path      TEXT PRIMARY KEY,
+    kind      TEXT NOT NULL,
+    mtime_ns  INTEGER NOT NULL,
+    size      INTEGER NOT NULL,
+    digest    TEXT NOT NULL
+);
+CREATE TABLE source_errors (
+    path      TEXT PRIMARY KEY,
+    kind      TEXT NOT NULL,
+    mtime_ns  INTEGER NOT NULL,
+    size      INTEGER NOT NULL,
+    message   TEXT NOT NULL
+);
+CREATE TABLE word_lists (
+    id      INTEGER PRIMARY KEY,
+    kind    TEXT NOT NULL,
+    source  TEXT NOT NULL REFERENCES sources(path)
+);
+CREATE TABLE entries (
+    list_id      INTEGER NOT NULL REFERENCES word_lists(id),
+    pos          INTEGER NOT NULL,
+    word         TEXT NOT NULL,
+    translation  TEXT,
+    add_info     TEXT,
+    PRIMARY KEY (list_id, pos)
+) WITHOUT ROWID;
+CREATE TABLE books (
+    id    INTEGER PRIMARY KEY,
+    name  TEXT NOT NULL UNIQUE
+);
+CREATE TABLE chapters (
+    id       INTEGER PRIMARY KEY,
+    book_id  INTEGER NOT NULL REFERENCES books(id),
+    name     TEXT NOT NULL,
+    UNIQUE (book_id, name)
+);
+CREATE TABLE sections (
+    id          INTEGER PRIMARY KEY,
+    chapter_id  INTEGER NOT NULL REFERENCES chapters(id),
+    name        TEXT NOT NULL,
+    list_id     INTEGER NOT NULL REFERENCES word_lists(id),
+    UNIQUE (chapter_id, name)
+);
+CREATE TABLE dictionaries (
+    id       INTEGER PRIMARY KEY,
+    name     TEXT NOT NULL UNIQUE,
+    list_id  INTEGER NOT NULL REFERENCES word_lists(id)
+);
+CREATE TABLE levels (
+    level    INTEGER PRIMARY KEY,
+    list_id  INTEGER NOT NULL REFERENCES word_lists(id)
+);
+CREATE TABLE contexts (
+    id       INTEGER PRIMARY KEY,
+    name     TEXT NOT NULL UNIQUE,
+    list_id  INTEGER NOT NULL REFERENCES word_lists(id)
+);
+CREATE TABLE verbs (
+    id          INTEGER PRIMARY KEY,
+    infinitive  TEXT NOT NULL UNIQUE,
+    source      TEXT NOT NULL REFERENCES sources(path)
+);
+CREATE TABLE verb_forms (
+    verb_id     INTEGER NOT NULL REFERENCES verbs(id),
+    tense_pos   INTEGER NOT NULL,
+    tense       TEXT NOT NULL,
+    person_pos  INTEGER NOT NULL,
+    person      TEXT NOT NULL,
+    form        TEXT NOT NULL,
+    PRIMARY KEY (verb_id, tense_pos, person_pos)
+) WITHOUT ROWID;
+"""
+
+
+# ======================================================
+# 🔨 BUILD
+# ======================================================
+
+def iter_sources(base_dir=BASE_DIR):
+    """
+    Liefert alle Quelldateien als (kind, relativer Pfad, Schlüssel).
+    Der Schlüssel hängt von der Art ab (Buch/Kapitel/Abschnitt, Lernstand, ...).
+    """
+    vokabel_folder = os.path.join(base_dir, "Vokabeln")
+    for book in list_dirs(vokabel_folder):
+        if book == DICTIONARY_DIR:
+            continue
+        for chapter in list_dirs(os.path.join(vokabel_folder, book)):
+            for f in list_json_files(os.path.join(vokabel_folder, book, chapter)):
+                yield "section", os.path.join("Vokabeln", book, chapter, f), (book, chapter, f)
+
+    for f in list_json_files(os.path.join(vokabel_folder, DICTIONARY_DIR)):
+        yield "dictionary", os.path.join("Vokabeln", DICTIONARY_DIR, f), f
+
+    for f in list_json_files(os.path.join(base_dir, "Kontexte")):
+        yield "context", os.path.join("Kontexte", f), f
+
+    for f in list_json_files(os.path.join(base_dir, "Kontexte", "Vokabeln")):
+        stem = f[:-len(".json")]
+        if stem.isdigit():
+            yield "level", os.path.join("Kontexte", "Vokabeln", f), int(stem)
+
+    for f in list_json_files(os.path.join(base_dir, "unregelmäßige Verben alle")):
+        yield "verbs", os.path.join("unregelmäßige Verben alle", f), f
+
+
+def _insert_word_list(conn, kind, rel_path, data):
+    list_id = conn.execute(
+        "INSERT INTO word_lists (kind, source) VALUES (?, ?)", (kind, rel_path)
+    ).lastrowid
+    conn.executemany(
+        "INSERT INTO entries (list_id, pos, word, translation, add_info) VALUES (?, ?, ?, ?, ?)",
+        [
+            (list_id, pos, item["word"], item.get("translation"), item.get("add"))
+            for pos, item in enumerate(data)
+            if "word" in item
+        ]
+    )
+    return list_id
+
+
+def _get_or_create(conn, sql_select, sql_insert, params):
+    row = conn.execute(sql_select, params).fetchone()
+    if row:
+        return row[0]
+    return conn.execute(sql_insert, params).lastrowid
+
+
+def _import_source(conn, base_dir, kind, rel_path, key):
+    full_path = os.path.join(base_dir, rel_path)
+    mtime_ns, size = signatur(full_path)
+    data, digest = load_json_mit_hash(full_path)
+
+    conn.execute(
+        "INSERT INTO sources (path, kind, mtime_ns, size, digest) VALUES (?, ?, ?, ?, ?)",
+        (rel_path, kind, mtime_ns, size, digest)
+    )
+
+    if kind == "section":
+        book, chapter, name = key
+        book_id = _get_or_create(
+            conn,
+            "SELECT id FROM books WHERE name = ?",
+            "INSERT INTO books (name) VALUES (?)",
+            (book,)
+        )
+        chapter_id = _get_or_create(
+            conn,
+            "SELECT id FROM chapters WHERE book_id = ? AND name = ?",
+            "INSERT INTO chapters (book_id, name) VALUES (?, ?)",
+            (book_id, chapter)
+        )
+        list_id = _insert_word_list(conn, kind, rel_path, data)
+        conn.execute(
+            "INSERT INTO sections (chapter_id, name, list_id) VALUES (?, ?, ?)",
+            (chapter_id, name, list_id)
+        )
+    elif kind == "dictionary":
+        list_id = _insert_word_list(conn, kind, rel_path, data)
+        conn.execute("INSERT INTO dictionaries (name, list_id) VALUES (?, ?)", (key, list_id))
+    elif kind == "context":
+        list_id = _insert_word_list(conn, kind, rel_path, data)
+        conn.execute("INSERT INTO contexts (name, list_id) VALUES (?, ?)", (key, list_id))
+    elif kind == "level":
+        list_id = _insert_word_list(conn, kind, rel_path, data)
+        conn.execute("INSERT INTO levels (level, list_id) VALUES (?, ?)", (key, list_id))
+    elif kind == "verbs":
+        for infinitive, tenses in data.items():
+            # Steht ein Verb in mehreren Dateien, gilt die letzte (wie dict.update)
+            conn.execute(
+                "DELETE FROM verb_forms WHERE verb_id IN (SELECT id FROM verbs WHERE infinitive = ?)",
+                (infinitive,)
+            )
+            verb_id = conn.execute(
+                "INSERT OR REPLACE INTO verbs (infinitive, source) VALUES (?, ?)", (infinitive, rel_path)
+            ).lastrowid
+            conn.executemany(
+                "INSERT INTO verb_forms VALUES (?, ?, ?, ?, ?, ?)",
+                [
+                    (verb_id, t_pos, tense, p_pos, person, form)
+                    for t_pos, (tense, persons) in enumerate(tenses.items())
+                    for p_pos, (person, form) in enumerate(persons.items())
+                ]
+            )
+
+
+# Fehler in einer einzelnen Quelldatei (kaputtes JSON, falscher Aufbau)
+QUELLFEHLER = (ValueError, TypeError, AttributeError, KeyError, OSError, sqlite3.Error)
+
+
+def _import_or_skip(conn, base_dir, kind, rel_path, key):
+    """
+    Wie _import_source, aber eine fehlerhafte Datei wird übersprungen und
+    mit ihrer Signatur in source_errors vermerkt (erst bei der nächsten
+    Änderung der Datei wieder versucht, siehe list_source_errors).
+    """
+    conn.execute("SAVEPOINT quelle")
+    try:
+        _import_source(conn, base_dir, kind, rel_path, key)
+    except QUELLFEHLER as e:
+        conn.execute("ROLLBACK TO quelle")
+        try:
+            mtime_ns, size = signatur(os.path.join(base_dir, rel_path))
+        except OSError:
+            mtime_ns, size = 0, 0
+        conn.execute(
+            "INSERT OR REPLACE INTO source_errors (path, kind, mtime_ns, size, message) "
+            "VALUES (?, ?, ?, ?, ?)",
+            (rel_path, kind, mtime_ns, size, f"{type(e).__name__}: {e}")
+        )
+    conn.execute("RELEASE quelle")
+
+
+def _remove_source(conn, rel_path):
+    list_ids = [r[0] for r in conn.execute(
+        "SELECT id FROM word_lists WHERE source = ?", (rel_path,)
+    )]
+    for list_id in list_ids:
+        conn.execute("DELETE FROM entries WHERE list_id = ?", (list_id,))
+        for table in ("sections", "dictionaries", "levels", "contexts"):
+            conn.execute(f"DELETE FROM {table} WHERE list_id = ?", (list_id,))
+    conn.execute("DELETE FROM word_lists WHERE source = ?", (rel_path,))
+    conn.execute(
+        "DELETE FROM verb_forms WHERE verb_id IN (SELECT id FROM verbs WHERE source = ?)",
+        (rel_path,)
+    )
+    conn.execute("DELETE FROM verbs WHERE source = ?", (rel_path,))
+    conn.execute("DELETE FROM sources WHERE path = ?", (rel_path,))
+    conn.execute("DELETE FROM source_errors WHERE path = ?", (rel_path,))
+
+
+def build_database(base_dir=BASE_DIR, db_path=DB_PATH):
+    """
+    Liest alle JSON-Quellen ein und schreibt die Datenbank neu.
+    Es wird in eine temporäre Datei geschrieben und erst am Ende ersetzt,
+    damit laufende Leser nie eine halbfertige Datenbank sehen.
+    """
+    fd, tmp_path = tempfile.mkstemp(suffix=".db", dir=os.path.dirname(os.path.abspath(db_path)))
+    os.close(fd)
+    try:
+        conn = sqlite3.connect(tmp_path)
+        try:
+            conn.executescript(SCHEMA)
+            with conn:
+                for kind, rel_path, key in iter_sources(base_dir):
+                    _import_or_skip(conn, base_dir, kind, rel_path, key)
+            conn.execute("CREATE INDEX entries_word ON entries (word COLLATE NOCASE)")
+            conn.execute("ANALYZE")
+        finally:
+            conn.close()
+        os.replace(tmp_path, db_path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    return db_path
+
+
+_refresh_lock = threading.Lock()
+_last_refresh = {}
+# Pro Datenbank: (Datei-Identität, Quellen), wie sie dieser Prozess zuletzt gesehen hat
+_gesehen = {}
+
+ALLE_ARTEN = {"section", "dictionary", "context", "level", "verbs"}
+
+
+def refresh_database(base_dir=BASE_DIR, db_path=DB_PATH, min_interval=0.0):
+    """
+    Gleicht die Datenbank mit den JSON-Dateien ab und spielt nur geänderte,
+    neue oder gelöschte Dateien neu ein. Geändert heißt: (mtime, Größe)
+    weicht ab und der Inhalts-Hash auch. Fehlerhafte Dateien werden
+    übersprungen (list_source_errors).
+
+    Rückgabe: Menge der Arten ("section", "dictionary", "context", "level",
+    "verbs"), die sich seit dem letzten Aufruf in diesem Prozess geändert
+    haben, auch wenn ein anderer Prozess sie eingespielt hat; zusätzlich
+    "database", wenn die Datei ersetzt wurde (offene Verbindungen lesen dann
+    noch die alte und müssen neu geöffnet werden).
+    min_interval: höchstens so oft (Sekunden) pro Prozess prüfen.
+    """
+    with _refresh_lock:
+        now = time.monotonic()
+        if now - _last_refresh.get(db_path, float("-inf")) < min_interval:
+            return set()
+        _last_refresh[db_path] = now
+
+        if not os.path.exists(db_path) or _schema_version(db_path) != SCHEMA_VERSION:
+            build_database(base_dir, db_path)
+
+        current = {}
+        for kind, rel_path, key in iter_sources(base_dir):
+            current[rel_path] = (kind, key, signatur(os.path.join(base_dir, rel_path)))
+
+        conn = sqlite3.connect(db_path, timeout=30)
+        try:
+            stored = _stored_sources(conn)
+            if not _unchanged(stored, current):
+                with conn:
+                    # Schreibsperre holen und neu lesen (andere Prozesse könnten schneller sein)
+                    conn.execute("BEGIN IMMEDIATE")
+                    _update(conn, base_dir, _stored_sources(conn), current)
+                stored = _stored_sources(conn)
+        finally:
+            conn.close()
+        return _aenderungen(db_path, stored)
+
+
+def _update(conn, base_dir, stored, current):
+    changed = set()
+    for rel_path, (kind, _, _) in stored.items():
+        if rel_path not in current:
+            _remove_source(conn, rel_path)
+            changed.add(kind)
+
+    for rel_path, (kind, key, sig) in current.items():
+        old = stored.get(rel_path)
+        if old is not None and old[1] == sig:
+            continue
+        if old is not None and old[2] is not None:
+            try:
+                _, digest = load_json_mit_hash(os.path.join(base_dir, rel_path))
+            except QUELLFEHLER:
+                digest = None
+            if old[2] == digest:
+                # nur angefasst: Signatur nachziehen, nichts neu einlesen
+                conn.execute(
+                    "UPDATE sources SET mtime_ns = ?, size = ? WHERE path = ?",
+                    (sig[0], sig[1], rel_path)
+                )
+                continue
+        if old is not None:
+            _remove_source(conn, rel_path)
+        if kind != "verbs":
+            _import_or_skip(conn, base_dir, kind, rel_path, key)
+        changed.add(kind)
+
+    if "verbs" in changed:
+        # Verben aus mehreren Dateien überschreiben sich (die letzte gilt),
+        # daher alle Verbdateien in der ursprünglichen Reihenfolge neu einspielen
+        for rel_path, (kind, key, _) in current.items():
+            if kind == "verbs":
+                _remove_source(conn, rel_path)
+                _import_or_skip(conn, base_dir, kind, rel_path, key)
+
+    if "section" in changed:
+        conn.execute("DELETE FROM chapters WHERE id NOT IN (SELECT chapter_id FROM sections)")
+        conn.execute("DELETE FROM books WHERE id NOT IN (SELECT book_id FROM chapters)")
+
+
+def _identitaet(db_path):
+    stat = os.stat(db_path)
+    return stat.st_dev, stat.st_ino
+
+
+def _aenderungen(db_path, stored):
+    """Arten, deren Inhalt sich seit dem letzten Aufruf in diesem Prozess geändert hat."""
+    identitaet = _identitaet(db_path)
+    # Vergleich nach Inhalt (Hash), bei fehlerhaften Dateien nach Signatur
+    inhalt = {
+        path: (kind, digest if digest is not None else sig)
+        for path, (kind, sig, digest) in stored.items()
+    }
+    alt = _gesehen.get(db_path)
+    _gesehen[db_path] = (identitaet, inhalt)
+    if alt is None:
+        # Erster Aufruf im Prozess: es gibt noch nichts Gecachtes
+        return set()
+    if alt[0] != identitaet:
+        return {"database"} | ALLE_ARTEN
+    return {
+        (inhalt.get(path) or alt[1][path])[0]
+        for path in alt[1].keys() | inhalt.keys()
+        if alt[1].get(path) != inhalt.get(path)
+    }
+
+
+def _stored_sources(conn):
+    """Eingespielte und übersprungene Quellen: Pfad -> (Art, Signatur, Hash bzw. None)."""
+    stored = {
+        path: (kind, (mtime_ns, size), None)
+        for path, kind, mtime_ns, size in conn.execute(
+            "SELECT path, kind, mtime_ns, size FROM source_errors"
+        )
+    }
+    stored.update(
+        (path, (kind, (mtime_ns, size), digest))
+        for path, kind, mtime_ns, size, digest in conn.execute(
+            "SELECT path, kind, mtime_ns, size, digest FROM sources"
+        )
+    )
+    return stored
+
+
+def _unchanged(stored, current):
+    return stored.keys() == current.keys() and all(
+        stored[path][1] == current[path][2] for path in current
+    )
+
+
+def _schema_version(db_path):
+    conn = sqlite3.connect(db_path)
+    try:
+        return conn.execute("PRAGMA user_version").fetchone()[0]
+    finally:
+        conn.close()
+
+
+# ======================================================
+# 🔎 ABFRAGEN
+# ======================================================
+
+def connect(db_path=DB_PATH, base_dir=BASE_DIR):
+    """
+    Öffnet die Datenbank nur lesend (wird bei Bedarf zuerst gebaut).
+    Die Verbindung darf von mehreren Streamlit-Threads benutzt werden.
+    """
+    if not os.path.exists(db_path):
+        build_database(base_dir, db_path)
+    uri = "file:" + db_path.replace("?", "%3f").replace("#", "%23") + "?mode=ro"
+    return sqlite3.connect(uri, uri=True, check_same_thread=False)
+
+
+def _entries(conn, list_ids):
+    if not list_ids:
+        return []
+    placeholders = ",".join("?" * len(list_ids))
+    rows = conn.execute(
+        f"SELECT list_id, pos, word, translation, add_info FROM entries "
+        f"WHERE list_id IN ({placeholders})",
+        list_ids
+    ).fetchall()
+    # Reihenfolge wie in list_ids, innerhalb einer Liste wie in der Datei
+    order = {list_id: i for i, list_id in enumerate(list_ids)}
+    rows.sort(key=lambda r: (order[r[0]], r[1]))
+
+    result = []
+    for _, _, word, translation, add_info in rows:
+        item = {"word": word}
+        if translation is not None:
+            item["translation"] = translation
+        if add_info is not None:
+            item["add"] = add_info
+        result.append(item)
+    return result
+
+
+def list_source_errors(conn):
+    """Übersprungene Quelldateien als [(Pfad, Fehlermeldung)]."""
+    return conn.execute("SELECT path, message FROM source_errors ORDER BY path").fetchall()
+
+
+def list_books(conn):
+    return [r[0] for r in conn.execute("SELECT name FROM books ORDER BY name")]
+
+
+def list_chapters(conn, book):
+    return [r[0] for r in conn.execute(
+        "SELECT c.name FROM chapters c JOIN books b ON b.id = c.book_id "
+        "WHERE b.name = ? ORDER BY c.name",
+        (book,)
+    )]
+
+
+def list_sections(conn, book, chapter):
+    return [r[0] for r in conn.execute(
+        "SELECT s.name FROM sections s "
+        "JOIN chapters c ON c.id = s.chapter_id "
+        "JOIN books b ON b.id = c.book_id "
+        "WHERE b.name = ? AND c.name = ? ORDER BY s.name",
+        (book, chapter)
+    )]
+
+
+def load_sections(conn, book, chapter, sections):
+    """Einträge der gewählten Abschnitte, in der angegebenen Reihenfolge."""
+    list_ids = []
+    for name in sections:
+        row = conn.execute(
+            "SELECT s.list_id FROM sections s "
+            "JOIN chapters c ON c.id = s.chapter_id "
+            "JOIN books b ON b.id = c.book_id "
+            "WHERE b.name = ? AND c.name = ? AND s.name = ?",
+            (book, chapter, name)
+        ).fetchone()
+        if row:
+            list_ids.append(row[0])
+    return _entries(conn, list_ids)
+
+
+def dictionary_digest(conn, name):
+    """Inhalts-Hash der Wörterbuch-Datei (Schlüssel für daraus gebaute Daten)."""
+    row = conn.execute(
+        "SELECT s.digest FROM dictionaries d "
+        "JOIN word_lists w ON w.id = d.list_id "
+        "JOIN sources s ON s.path = w.source "
+        "WHERE d.name = ?",
+        (name,)
+    ).fetchone()
+    return row[0] if row else None
+
+
+def list_dictionaries(conn):
+    return [r[0] for r in conn.execute("SELECT name FROM dictionaries ORDER BY name")]
+
+
+def load_dictionary(conn, name):
+    row = conn.execute("SELECT list_id FROM dictionaries WHERE name = ?", (name,)).fetchone()
+    return _entries(conn, [row[0]]) if row else []
+
+
+def list_contexts(conn):
+    return [r[0] for r in conn.execute("SELECT name FROM contexts ORDER BY name")]
+
+
+def load_context(conn, name):
+    row = conn.execute("SELECT list_id FROM contexts WHERE name = ?", (name,)).fetchone()
+    return _entries(conn, [row[0]]) if row else []
+
+
+def list_levels(conn):
+    return [r[0] for r in conn.execute("SELECT level FROM levels ORDER BY level")]
+
+
+def load_levels(conn, up_to):
+    """Alle Einträge der Lernstände 1..up_to."""
+    list_ids = [r[0] for r in conn.execute(
+        "SELECT list_id FROM levels WHERE level <= ? ORDER BY level", (up_to,)
+    )]
+    return _entries(conn, list_ids)
+
+
+def load_first_levels(conn):
+    """
+    Wort (kleingeschrieben) -> erster Lernstand, in dem es vorkommt.
+    Damit ist "ist das Wort bis Lernstand N bekannt?" ein einziger Vergleich.
+    """
+    rows = conn.execute(
+        "SELECT l.level, e.word FROM levels l JOIN entries e ON e.list_id = l.list_id "
+        "ORDER BY l.level"
+    )
+    first_levels = {}
+    for level, word in rows:
+        first_levels.setdefault(word.lower(), level)
+    return first_levels
+
+
+def load_verbs(conn):
+    """Alle Verben als {Infinitiv: {Zeitform: {Person: Form}}} wie in den JSON-Dateien."""
+    words_data = {}
+    rows = conn.execute(
+        "SELECT v.infinitive, f.tense, f.person, f.form FROM verb_forms f "
+        "JOIN verbs v ON v.id = f.verb_id "
+        "ORDER BY v.infinitive, f.tense_pos, f.person_pos"
+    )
+    for infinitive, tense, person, form in rows:
+        words_data.setdefault(infinitive, {}).setdefault(tense, {})[person] = form
+    return words_data
+
+
+if __name__ == "__main__":
+    path = build_database()
+    print(f"Datenbank geschrieben: {path}")
+    for rel_path, message in list_source_errors(connect(path)):
+        print(f"Übersprungen: {rel_path} ({message})")
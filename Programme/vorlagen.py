@@ -0,0 +1,126 @@
+"""
+Cache für Word-Vorlagen.
+
+Jede Vorlage wird pro Prozess nur einmal entpackt und geparst. Jeder
+Generator bekommt eine Kopie des geparsten Dokuments (deepcopy des
+Objektbaums, deutlich billiger als erneutes Entpacken). Ändert sich die
+.docx-Datei, wird sie neu eingelesen. Mehrere Vorlagen werden nebeneinander
+gehalten.
+
+Für das direkte Schreiben des Dokument-XML (Programme/dokument.py) gibt es
+zusätzlich die Rohvorlage: alle Teile der .docx als Bytes, dazu das
+document.xml aufgeteilt in den Teil vor und nach dem neuen Inhalt.
+"""
+import copy
+import os
+import threading
+import zipfile
+
+from docx import Document
+from docx.api import _default_docx_path
+from docx.oxml import parse_xml
+from docx.oxml.ns import qn
+from docx.shared import Inches, Twips
+from docx.styles import BabelFish
+
+from Programme.dateicache import signatur
+
+DOCUMENT_XML = "word/document.xml"
+STYLES_XML = "word/styles.xml"
+
+_vorlagen = {}
+_rohvorlagen = {}
+_lock = threading.Lock()
+
+
+def lade_vorlage(template_path=None):
+    """Frisches Dokument auf Basis der Vorlage (ohne Pfad: python-docx-Standard)."""
+    if template_path:
+        key = os.path.abspath(template_path)
+        sig = signatur(key)
+    else:
+        key, sig = None, None
+
+    with _lock:
+        entry = _vorlagen.get(key)
+        if entry is None or entry[0] != sig:
+            entry = (sig, Document(template_path) if template_path else Document())
+            _vorlagen[key] = entry
+
+    return copy.deepcopy(entry[1])
+
+
+class Rohvorlage:
+    """
+    teile:       [(ZipInfo, Bytes)] aller Teile außer document.xml
+    document_info: ZipInfo des document.xml
+    kopf / fuss: document.xml bis zum Ende des vorhandenen Inhalts bzw.
+                 ab der Abschnitts-Einstellung (w:sectPr) am Ende des Body
+    blockbreite: Seitenbreite ohne Ränder in EMU (wie doc._block_width)
+    """
+
+    def __init__(self, path):
+        with zipfile.ZipFile(path) as z:
+            self.document_info = z.getinfo(DOCUMENT_XML)
+            self.teile = [
+                (info, z.read(info)) for info in z.infolist()
+                if info.filename != DOCUMENT_XML
+            ]
+            document = z.read(DOCUMENT_XML)
+            styles = z.read(STYLES_XML) if STYLES_XML in z.namelist() else None
+
+        # Neuer Inhalt kommt wie bei python-docx vor das w:sectPr des Body
+        ende = document.rfind(b"<w:sectPr")
+        if ende == -1 or b"</w:p>" in document[ende:]:
+            ende = document.rfind(b"</w:body>")
+        self.kopf = document[:ende]
+        self.fuss = document[ende:]
+
+        sect_pr = parse_xml(document).find(qn("w:body")).find(qn("w:sectPr"))
+        self.blockbreite = Inches(6.5)
+        if sect_pr is not None:
+            pg_sz, pg_mar = sect_pr.find(qn("w:pgSz")), sect_pr.find(qn("w:pgMar"))
+            if pg_sz is not None and pg_mar is not None:
+                self.blockbreite = Twips(
+                    int(pg_sz.get(qn("w:w")))
+                    - int(pg_mar.get(qn("w:left"), 0))
+                    - int(pg_mar.get(qn("w:right"), 0))
+                )
+
+        self._style_namen = {}
+        self._style_ids = set()
+        if styles is not None:
+            for style in parse_xml(styles).iter(qn("w:style")):
+                style_id = style.get(qn("w:styleId"))
+                self._style_ids.add(style_id)
+                name = style.find(qn("w:name"))
+                if name is not None:
+                    self._style_namen.setdefault(name.get(qn("w:val")), style_id)
+
+    def style_id(self, name):
+        """Style-ID einer Formatvorlage, angegeben per Name (wie in Word) oder ID."""
+        style_id = self._style_namen.get(BabelFish.ui2internal(name))
+        if style_id is None and name in self._style_ids:
+            style_id = name
+        if style_id is None:
+            raise KeyError("Keine Formatvorlage '%s' in der Vorlage" % name)
+        return style_id
+
+
+def lade_rohvorlage(template_path=None):
+    """Rohvorlage (gecacht, nicht kopiert: sie wird nur gelesen)."""
+    path = os.path.abspath(template_path) if template_path else _default_docx_path()
+    sig = signatur(path)
+
+    with _lock:
+        entry = _rohvorlagen.get(path)
+        if entry is None or entry[0] != sig:
+            entry = (sig, Rohvorlage(path))
+            _rohvorlagen[path] = entry
+    return entry[1]
+
+
+def leere_cache():
+    with _lock:
+        _vorlagen.clear()
+        _rohvorlagen.clear()
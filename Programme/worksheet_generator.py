@@ -1,3 +1,60 @@
+"""
+Differenzierter Lückentext: Lücken werden im Text mit [eckigen Klammern]
+markiert und je nach Modul als Unterstriche, mit erstem Buchstaben oder
+mit deutscher Wortbox ausgegeben.
+
+Der Text wird einmal in Teile zerlegt (zerlege), abwechselnd Klartext
+und Lücke; jedes Modul setzt nur noch die Teile zusammen. Die Lücken
+sind freier Text, ihre Masken werden daher direkt berechnet und nicht
+im Wortform-Cache abgelegt.
+"""
+import re
+from typing import NamedTuple
+
+from Programme.sprache import suchformen, wortform
+
+LUECKE = re.compile(r"\[([^\]]+)\]")
+
+
+class Luecke(NamedTuple):
+    eintrag: str    # Text zwischen den Klammern
+
+
+def zerlege(text):
+    """
+    Markierten Text in einem Durchgang zerlegen: [Klartext, Luecke,
+    Klartext, …, Klartext], Klartext an geraden Stellen (ggf. leer).
+    """
+    teile = []
+    pos = 0
+    for treffer in LUECKE.finditer(text):
+        teile.append(text[pos:treffer.start()])
+        teile.append(Luecke(treffer.group(1)))
+        pos = treffer.end()
+    teile.append(text[pos:])
+    return teile
+
+
+def luecken(teile):
+    return teile[1::2]
+
+
+def zusammensetzen(teile, maske):
+    """Klartext bleibt, jede Lücke wird durch ihre Maske ersetzt (Feld maske von sprache.Wortform)."""
+    return "".join(
+        teil if i % 2 == 0 else getattr(wortform(teil.eintrag), maske)
+        for i, teil in enumerate(teile)
+    )
+
+
+# Maske der Lücken je Modul (3: Unterstriche, die Wörter stehen deutsch in der Box)
+MASKEN = {
+    1: "maske",
+    2: "erster_buchstabe",
+    3: "maske",
+}
+
+
 def generate_worksheets_streamlit(
     text: str,
     vocab_json: list,
@@ -5,23 +62,32 @@ def generate_worksheets_streamlit(
     selected_modules: list = [1, 2, 3],
     template_path: str = None
 ):
-    import re
     import random
     from io import BytesIO
-    from docx import Document
+    from Programme.vorlagen import lade_vorlage
     from docx.enum.text import WD_PARAGRAPH_ALIGNMENT
     from docx.shared import Pt
     from docx.oxml import OxmlElement
     from docx.oxml.ns import qn
 
     # Vorlage laden oder neues Dokument
-    if template_path:
-        doc = Document(template_path)
-    else:
-        doc = Document()
+    doc = lade_vorlage(template_path)
 
     # Vokabeln für Übersetzung
     FR_TO_DE = {v["word"].lower(): v["translation"] for v in vocab_json}
+    # Automatisch markierte Lücken stehen oft ohne Artikel oder Satzzeichen im Text
+    FORMEN_TO_DE = {}
+    for v in vocab_json:
+        for form in suchformen(v["word"]):
+            FORMEN_TO_DE.setdefault(form, v["translation"])
+
+    def uebersetzung(w):
+        if w.lower() in FR_TO_DE:
+            return FR_TO_DE[w.lower()]
+        for form in suchformen(w):
+            if form in FORMEN_TO_DE:
+                return FORMEN_TO_DE[form]
+        return w
 
     MODULES = {
         1: "Nur_Unterstriche",
@@ -29,35 +95,25 @@ def generate_worksheets_streamlit(
         3: "Deutsch_in_Box"
     }
 
-    # --- 1. Box einmal erstellen ---
-    box = []
-
-    def collect_words(match):
-        entry = match.group(1)
-        words = entry.split()
-        box.append(entry)  # Ursprünglicher Eintrag, für Box
-        return match.group(0)  # Text vorerst unverändert
-
-    re.sub(r"\[([^\]]+)\]", collect_words, text)
+    # --- 1. Text einmal zerlegen, Box aus den Lücken ---
+    teile = zerlege(text)
+    box = [luecke.eintrag for luecke in luecken(teile)]  # Ursprünglicher Eintrag, für Box
 
     # Box einmal mischen
     random.shuffle(box)
 
+    # Lückentexte, je Maske einmal zusammengesetzt (Module 1 und 3 teilen sich einen)
+    task_texts = {}
+
     # --- 2. Schleife über Module ---
     for mode in selected_modules:
         mode_name = MODULES[mode]
 
-        def replace(match):
-            entry = match.group(1)
-            words = entry.split()
-            # Text ersetzen je nach Modul
-            if mode == 1 or mode == 3:
-                return "   ".join(["_ " * len(w) for w in words]).strip()
-            elif mode == 2:
-                return "   ".join([w[0] + " " + "_ " * (len(w)-1) for w in words]).strip()
-
         # Lückentext erzeugen
-        task_text = re.sub(r"\[([^\]]+)\]", replace, text)
+        maske = MASKEN[mode]
+        if maske not in task_texts:
+            task_texts[maske] = zusammensetzen(teile, maske)
+        task_text = task_texts[maske]
 
         # --- Überschrift ---
         title = doc.add_heading(f"{output_prefix} – {mode_name.replace('_', ' ')}", level=1)
@@ -79,7 +135,7 @@ def generate_worksheets_streamlit(
         if box:
             # Bei Modul 3: übersetzen
             if mode == 3:
-                display_box = [FR_TO_DE.get(w.lower(), w) for w in box]
+                display_box = [uebersetzung(w) for w in box]
             else:
                 display_box = box
 
@@ -1,42 +1,17 @@
 import streamlit as st
 import os
-import json
+import random
+from contextlib import contextmanager
 
-from Programme.Konjugationstabelle import run_konjugationstabelle
-from Programme.Wortschlange import run_Wortschlange
-from Programme.Vokabelrätsel import run_Rätsel
-from Programme.Vokabelsuchgitter import run_Vokabelsuchgitter
-from Programme.worksheet_generator import generate_worksheets_streamlit
-from Programme.Listen import Vokabellisten
-from Programme.Worte_verbinden import Worte_zuordnen
-from Programme.Konjugationen_Unterstriche import run_Unterstriche_Konjugationen
+# Generatoren (python-docx) werden erst beim ersten Klick geladen;
+# fertige Arbeitsblätter kommen bei gleicher Anfrage aus dem Ergebnis-Cache
+from Programme import ergebnis_cache, generatoren
+from Programme.generatoren import SEED_PROGRAMME, VOKABEL_PROGRAMME
 
-# ======================================================
-# 📦 CACHING / FILE HELPERS (CLOUD-SICHER)
-# ======================================================
-
-@st.cache_data
-def list_dirs(path):
-    if not os.path.exists(path):
-        return []
-    return sorted([
-        d for d in os.listdir(path)
-        if os.path.isdir(os.path.join(path, d))
-    ])
-
-@st.cache_data
-def list_json_files(path):
-    if not os.path.exists(path):
-        return []
-    return sorted([
-        f for f in os.listdir(path)
-        if f.endswith(".json")
-    ])
-
-@st.cache_data
-def load_json(path):
-    with open(path, "r", encoding="utf-8") as f:
-        return json.load(f)
+from Programme import ablage, sprache, vokabel_db
+from Programme.suche import SuchIndex
+from Programme.markierung import Automat, anzahl_luecken, markiere
+from Programme.konjugationen import KonjugationsTabelle
 
 # ======================================================
 # 📂 BASIS-PFADE
@@ -45,15 +20,322 @@ def load_json(path):
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 
 template_path = os.path.join(BASE_DIR, "Vorlagen", "Vorlage Vokabellisten.docx")
-vokabel_folder = os.path.join(BASE_DIR, "Vokabeln")
-kontext_folder = os.path.join(BASE_DIR, "Kontexte")
-vocab_folder = os.path.join(vokabel_folder, "vocabs_all")
-verbs_folder = os.path.join(BASE_DIR, "unregelmäßige Verben alle")
+db_path = os.path.join(BASE_DIR, "vokabeln.db")
+
+# ======================================================
+# 📦 VOKABEL-DATENBANK (einmal pro Prozess geöffnet)
+# ======================================================
+
+def vorbereitet(eintraege):
+    # Wortformen (sprache.wortform) einmal hier in den gecachten Ladern,
+    # die Generatoren schlagen sie danach nur noch nach
+    sprache.vorbereiten(e["word"] for e in eintraege if "word" in e)
+    return eintraege
+
+@st.cache_resource
+def get_db():
+    return vokabel_db.connect(db_path, BASE_DIR)
+
+@st.cache_resource
+def get_konjugationen():
+    return KonjugationsTabelle.from_db(get_db())
+
+@st.cache_resource
+def get_lernstaende():
+    """(vorhandene Lernstände, Wort -> erster Lernstand), einmal pro Prozess."""
+    return vokabel_db.list_levels(get_db()), vokabel_db.load_first_levels(get_db())
+
+@st.cache_resource
+def get_kontext_mit_lernstand(kontext_file):
+    """Kontext-Einträge mit dem ersten Lernstand jedes Wortes (None = in keinem)."""
+    _, first_levels = get_lernstaende()
+    return [
+        (first_levels.get(item.get("word", "").lower()), item)
+        for item in vorbereitet(vokabel_db.load_context(get_db(), kontext_file))
+    ]
+
+@st.cache_resource
+def get_woerterbuch(vocab_file, digest):
+    # digest gehört nur zum Schlüssel (geänderte Datei -> neu laden);
+    # alle Sitzungen teilen sich die Liste, also nicht verändern
+    return vorbereitet(vokabel_db.load_dictionary(get_db(), vocab_file))
+
+@st.cache_resource
+def get_suchindex(vocab_file):
+    # Einmal gebaut liegt der Index in der Ablage, andere Prozesse laden ihn nur noch
+    digest = vokabel_db.dictionary_digest(get_db(), vocab_file)
+    return ablage.standard().hole_oder_baue(
+        ("suchindex", SuchIndex.VERSION, digest),
+        lambda: SuchIndex(vokabel_db.load_dictionary(get_db(), vocab_file))
+    )
+
+@st.cache_resource
+def get_markierung(vocab_file):
+    # Automat für die automatischen Lücken, wie der Suchindex über die Ablage geteilt
+    digest = vokabel_db.dictionary_digest(get_db(), vocab_file)
+    return ablage.standard().hole_oder_baue(
+        ("markierung", Automat.VERSION, digest),
+        lambda: Automat(vokabel_db.load_dictionary(get_db(), vocab_file))
+    )
+
+@st.cache_resource
+def get_kapitel_markierung(book, chapter):
+    """(Einträge aller Abschnitte des Kapitels, Automat daraus)."""
+    eintraege = vorbereitet(vokabel_db.load_sections(
+        get_db(), book, chapter, vokabel_db.list_sections(get_db(), book, chapter)
+    ))
+    return eintraege, Automat(eintraege)
+
+# Geänderte/neue JSON-Dateien nachladen (höchstens alle 2 s prüfen).
+# Nur die davon abhängigen Caches werden geleert, der Rest bleibt warm.
+geaendert = vokabel_db.refresh_database(BASE_DIR, db_path, min_interval=2.0)
+if "database" in geaendert:
+    get_db.clear()
+if geaendert & {"dictionary"}:
+    get_woerterbuch.clear()
+    get_suchindex.clear()
+    get_markierung.clear()
+if geaendert & {"section"}:
+    get_kapitel_markierung.clear()
+if geaendert & {"verbs"}:
+    get_konjugationen.clear()
+if geaendert & {"level"}:
+    get_lernstaende.clear()
+if geaendert & {"level", "context"}:
+    get_kontext_mit_lernstand.clear()
+
+db = get_db()
+
+# Fehlerhafte JSON-Dateien werden beim Einlesen übersprungen statt die App anzuhalten
+for pfad, meldung in vokabel_db.list_source_errors(db):
+    st.warning(f"{pfad} wurde übersprungen: {meldung}")
+
+vocab_files = vokabel_db.list_dictionaries(db)
+
+# ======================================================
+# 🔍 WÖRTERBUCH-SUCHE (gemeinsam für alle Tabs)
+# ======================================================
+
+SUCH_LIMIT = 20
+
+def woerterbuch_suche(state_key, widget_key, vocab_file="Wörterbuch.json"):
+    """
+    Suchfeld mit Trefferliste (höchstens SUCH_LIMIT Einträge).
+    Erst die in der Vorschau ausgewählten Treffer werden in
+    st.session_state[state_key] übernommen.
+    """
+    if state_key not in st.session_state:
+        st.session_state[state_key] = []
+
+    search_term = st.text_input(
+        "Suche Wörter im Wörterbuch",
+        key=f"search_{widget_key}"
+    )
+
+    treffer = get_suchindex(vocab_file).search(search_term, k=SUCH_LIMIT) if search_term else []
+    if search_term and not treffer:
+        st.caption("Keine Treffer")
+
+    treffer_dict = {item["word"]: item for item in treffer if "translation" in item}
+    auswahl = st.multiselect(
+        f"Treffer (max. {SUCH_LIMIT})",
+        list(treffer_dict),
+        format_func=lambda w: f"{w} – {treffer_dict[w]['translation']}",
+        key=f"preview_{widget_key}_{search_term}"
+    )
+
+    if st.button("Hinzufügen", key=f"add_{widget_key}") and auswahl:
+        st.session_state[state_key].extend(treffer_dict[w] for w in auswahl)
+        # Dubletten entfernen
+        st.session_state[state_key] = list({
+            item["word"]: item for item in st.session_state[state_key]
+        }.values())
+
+    return st.session_state[state_key]
+
+# ======================================================
+# 🎲 SEED + 🅰️🅱️ VARIANTEN (Gruppen A, B, C …)
+# ======================================================
+
+VARIANTEN_ZIP = "ZIP (eine Datei pro Gruppe)"
+MAX_SEED = 999_999
+
+def seed_auswahl(program, widget_key):
+    """
+    Seed für Programme mit Zufall: gleicher Seed = gleiches Arbeitsblatt
+    (kommt dann aus dem Cache), "Neu mischen" zieht einen neuen.
+    Liefert die Optionen für den Generator ({"seed": …} oder {}).
+    """
+    if program not in SEED_PROGRAMME:
+        return {}
+
+    key = f"seed_{widget_key}"
+    if key not in st.session_state:
+        st.session_state[key] = random.randint(0, MAX_SEED)
+
+    spalte_seed, spalte_mischen = st.columns([3, 1])
+    # Der Button steht vor dem Eingabefeld im Code, damit der neue Seed
+    # noch in diesem Durchlauf gesetzt werden kann
+    if spalte_mischen.button("🔀 Neu mischen", key=f"mischen_{widget_key}"):
+        st.session_state[key] = random.randint(0, MAX_SEED)
+    seed = spalte_seed.number_input("Seed", 0, MAX_SEED, key=key)
+    return {"seed": int(seed)}
+
+def varianten_auswahl(widget_key):
+    """Anzahl der Varianten und Ausgabeform (nur bei mehr als einer Variante)."""
+    anzahl = st.number_input(
+        "Varianten (Gruppen A, B, C …)", 1, 6, 1, key=f"varianten_{widget_key}"
+    )
+    ausgabe = None
+    if anzahl > 1:
+        ausgabe = st.radio(
+            "Ausgabe", ["Ein Dokument", VARIANTEN_ZIP], horizontal=True, key=f"ausgabe_{widget_key}"
+        )
+    return anzahl, ausgabe
+
+def varianten_download(program, anzahl, ausgabe, basis_seed, *args, **kwargs):
+    """Erzeugt die Varianten (parallel) ab basis_seed und zeigt den Download samt Seeds an."""
+    from Programme import varianten
+
+    seeds = varianten.varianten_seeds(basis_seed, anzahl)
+    docs = varianten.erstelle_varianten(program, seeds, *args, **kwargs)
+    st.caption("Seeds zum Nachdrucken: " + ", ".join(
+        f"Gruppe {varianten.gruppe(i)} = {seed}" for i, seed in enumerate(seeds)
+    ))
+
+    if ausgabe == VARIANTEN_ZIP:
+        st.download_button(
+            "⬇️ ZIP herunterladen",
+            varianten.als_zip(program, docs),
+            f"{program}_Gruppen.zip",
+            mime="application/zip"
+        )
+    else:
+        st.download_button(
+            "⬇️ Word herunterladen",
+            varianten.zusammenfuegen(docs),
+            f"{program}_Gruppen.docx",
+            mime="application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+        )
+
+# ======================================================
+# 🔠 SUCHGITTER-OPTIONEN
+# ======================================================
+
+def suchgitter_optionen(program, widget_key):
+    """Zusätzliche Richtungen für das Vokabelsuchgitter ({} bei anderen Programmen)."""
+    if program != "Vokabelsuchgitter":
+        return {}
+    spalte_diagonal, spalte_rueckwaerts = st.columns(2)
+    return {
+        "diagonal": spalte_diagonal.checkbox("Auch diagonal", key=f"diagonal_{widget_key}"),
+        "rueckwaerts": spalte_rueckwaerts.checkbox("Auch rückwärts", key=f"rueckwaerts_{widget_key}"),
+    }
+
+@contextmanager
+def suchgitter_fehler():
+    """Passen die Wörter nicht ins Suchgitter, eine Meldung statt eines Tracebacks."""
+    try:
+        yield
+    except ValueError as e:
+        # Erst hier importieren (NumPy), geladen ist das Modul dann ohnehin
+        from Programme.suchgitter import KeinPlatz
+        if not isinstance(e, KeinPlatz):
+            raise
+        st.error(f"{e}. Bitte weniger oder kürzere Wörter auswählen.")
+
+# ======================================================
+# ⚡ MEHRERE PROGRAMME AUF EINMAL
+# ======================================================
+
+DOCX_MIME = "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+
+def _zeige_ergebnis(platz, program, ergebnis, widget_key):
+    if isinstance(ergebnis, bytes):
+        platz.download_button(
+            f"⬇️ {program} herunterladen",
+            ergebnis,
+            f"{program}.docx",
+            mime=DOCX_MIME,
+            key=f"alle_download_{widget_key}_{program}"
+        )
+    else:
+        platz.error(f"{program}: {ergebnis}")
+
+def alle_programme(word_pairs, widget_key):
+    """
+    Mehrere Programme für dieselben Wörter, parallel erzeugt. Jeder
+    Download-Button erscheint, sobald sein Arbeitsblatt fertig ist.
+    Die Dateien bleiben im Session State, damit ein Download (löst einen
+    Rerun aus) die übrigen Buttons nicht verschwinden lässt.
+    """
+    auswahl = st.multiselect("Programme", VOKABEL_PROGRAMME, key=f"alle_programme_{widget_key}")
+    seed_optionen = seed_auswahl(
+        next((p for p in auswahl if p in SEED_PROGRAMME), None), f"alle_{widget_key}"
+    )
+    auftraege = [
+        (program, (word_pairs, template_path), seed_optionen if program in SEED_PROGRAMME else {})
+        for program in auswahl
+    ]
+    ergebnis_key = f"alle_ergebnisse_{widget_key}"
+
+    if st.button("Alle erstellen", key=f"alle_run_{widget_key}") and auswahl:
+        if not word_pairs:
+            st.warning("Bitte zuerst Wörter auswählen!")
+            return
+
+        plaetze = [st.empty() for _ in auswahl]
+        for platz, program in zip(plaetze, auswahl):
+            platz.info(f"⏳ {program} wird erstellt …")
 
-os.makedirs(vocab_folder, exist_ok=True)
-os.makedirs(kontext_folder, exist_ok=True)
+        ergebnisse = [None] * len(auswahl)
+        for index, ergebnis in ergebnis_cache.erstelle_alle(auftraege):
+            if isinstance(ergebnis, Exception):
+                ergebnis = f"{type(ergebnis).__name__}: {ergebnis}"
+            else:
+                ergebnis = ergebnis.getvalue()
+            ergebnisse[index] = ergebnis
+            _zeige_ergebnis(plaetze[index], auswahl[index], ergebnis, widget_key)
+        st.session_state[ergebnis_key] = (auftraege, ergebnisse)
 
-vocab_files = list_json_files(vocab_folder)
+    elif st.session_state.get(ergebnis_key, (None,))[0] == auftraege:
+        # Nur anzeigen, solange Wörter, Programme und Seed noch passen
+        for program, ergebnis in zip(auswahl, st.session_state[ergebnis_key][1]):
+            _zeige_ergebnis(st, program, ergebnis, widget_key)
+
+# ======================================================
+# 👥 TESTS FÜR DIE GANZE KLASSE
+# ======================================================
+
+KLASSEN_ZIP = "ZIP (ein Test pro Datei)"
+
+def klassen_tests(konjugationen, rows, time1, time2, verben, seed):
+    """Viele verschiedene Konjugationstests (z.B. einer pro Schüler), Verben und Personen gleich verteilt."""
+    from Programme.Konjugationen_Unterstriche import konjugationstests_zip, run_Unterstriche_Konjugationen
+
+    anzahl = st.number_input("Anzahl Tests", 2, 500, 30, key="klassen_anzahl")
+    ausgabe = st.radio("Ausgabe", ["Ein Dokument", KLASSEN_ZIP], horizontal=True, key="klassen_ausgabe")
+
+    if st.button("Tests erstellen", key="klassen_erstellen"):
+        try:
+            if ausgabe == KLASSEN_ZIP:
+                datei = konjugationstests_zip(
+                    konjugationen, rows, time1, time2, template_path, anzahl, verben=verben, seed=seed
+                )
+            else:
+                datei = run_Unterstriche_Konjugationen(
+                    konjugationen, rows, time1, time2, template_path,
+                    verben=verben, backend="stream", seed=seed, anzahl=anzahl
+                )
+        except ValueError as e:
+            st.error(str(e))
+            return
+
+        st.caption(f"Seed zum Nachdrucken: {seed}")
+        if ausgabe == KLASSEN_ZIP:
+            st.download_button("⬇️ ZIP herunterladen", datei, "Konjugationstests.zip", mime="application/zip")
+        else:
+            st.download_button("⬇️ Word herunterladen", datei, "Konjugationstests.docx", mime=DOCX_MIME)
 
 # ======================================================
 # 🚀 STREAMLIT SETUP
@@ -83,13 +365,39 @@ with tab_diff:
     )
 
     if vocab_files:
-        vocab_json = load_json(os.path.join(vocab_folder, vocab_files[0]))
+        # Aus dem Cache: ein Durchlauf ohne Klick kostet nur die Abfrage des Hashes
+        vocab_json = get_woerterbuch(vocab_files[0], vokabel_db.dictionary_digest(db, vocab_files[0]))
     else:
         vocab_json = []
 
+    automatisch = st.checkbox("Lücken automatisch markieren", key="diff_automatisch")
+    automat = None
+    if automatisch:
+        quelle = st.radio("Wörter aus", ["Wörterbuch", "Kapitel"], horizontal=True, key="diff_quelle")
+        if quelle == "Wörterbuch":
+            if vocab_files:
+                automat = get_markierung(vocab_files[0])
+        else:
+            books = vokabel_db.list_books(db)
+            spalte_buch, spalte_kapitel = st.columns(2)
+            book = spalte_buch.selectbox("Buch", books, key="diff_buch") if books else None
+            chapters = vokabel_db.list_chapters(db, book) if book else []
+            chapter = spalte_kapitel.selectbox("Kapitel", chapters, key="diff_kapitel") if chapters else None
+            if chapter:
+                kapitel_eintraege, automat = get_kapitel_markierung(book, chapter)
+                # Übersetzungen für die deutsche Wortbox auch aus dem Kapitel
+                vocab_json = kapitel_eintraege + vocab_json
+
     if st.button("Arbeitsblatt erstellen", key="diff_create_worksheet") and user_text and vocab_json:
-        file = generate_worksheets_streamlit(
-            text=user_text,
+        text = user_text
+        if automat is not None:
+            text = markiere(user_text, automat)
+            with st.expander(f"Markierter Text ({anzahl_luecken(text)} Lücken)"):
+                st.text(text)
+
+        file = generatoren.erstelle(
+            "Differenzierung",
+            text=text,
             vocab_json=vocab_json,
             output_prefix="Differenzierung",
             selected_modules=[1, 2, 3],
@@ -108,17 +416,13 @@ with tab_diff:
 # ======================================================
 
 with tab_verben:
-    json_files = list_json_files(verbs_folder)
+    konjugationen = get_konjugationen()
 
-    if not json_files:
+    if not len(konjugationen):
         st.warning("Keine Verb-Dateien gefunden")
         st.stop()
 
-    words_data = {}
-    for f in json_files:
-        words_data.update(load_json(os.path.join(verbs_folder, f)))
-
-    all_verbs = sorted(words_data.keys())
+    all_verbs = sorted(konjugationen.verbs)
 
     selected_verbs = st.multiselect(
         "Verben auswählen",
@@ -130,7 +434,7 @@ with tab_verben:
     if not selected_verbs:
         st.stop()
 
-    times = list(words_data[selected_verbs[0]].keys())
+    times = konjugationen.zeitformen(selected_verbs[0])
 
     time1 = st.selectbox(
         "Zeitform 1",
@@ -147,148 +451,193 @@ with tab_verben:
 
     rows = st.number_input("Zeilen", 1, 100, 20)
 
+    seed_optionen = seed_auswahl("Konjugationen", "verben")
+    anzahl_varianten, varianten_ausgabe = varianten_auswahl("verben")
+
     if st.button("Arbeitsblatt erstellen", key="verbs_create_worksheet"):
-        filtered = {v: words_data[v] for v in selected_verbs}
-
-        file = run_Unterstriche_Konjugationen(
-            filtered,
-            rows,
-            time1,
-            time2,
-            template_path
-        )
+        if anzahl_varianten > 1:
+            varianten_download(
+                "Konjugationen",
+                anzahl_varianten,
+                varianten_ausgabe,
+                seed_optionen["seed"],
+                konjugationen,
+                rows,
+                time1,
+                time2,
+                template_path,
+                verben=selected_verbs
+            )
+        else:
+            file = ergebnis_cache.erstelle(
+                "Konjugationen",
+                konjugationen,
+                rows,
+                time1,
+                time2,
+                template_path,
+                verben=selected_verbs,
+                **seed_optionen
+            )
 
-        st.download_button(
-            "⬇️ Word herunterladen",
-            file,
-            "Konjugationen_Unterstriche.docx",
-            mime="application/vnd.openxmlformats-officedocument.wordprocessingml.document"
-        )
+            st.download_button(
+                "⬇️ Word herunterladen",
+                file,
+                "Konjugationen_Unterstriche.docx",
+                mime="application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+            )
+
+    with st.expander("👥 Tests für die ganze Klasse"):
+        klassen_tests(konjugationen, rows, time1, time2, selected_verbs, seed_optionen["seed"])
 
 # ======================================================
 # 3️⃣ VOKABELN (KOMPLETT GEFIXT)
 # ======================================================
 
-with tab_vokabeln:
-    st.info("💡 Hinweis: Wenn die Suche verwendet und ABs erstellt wurden, muss die Seite neu geladen werden, bevor zu anderen Vokabeln ABs erstellt werden können.")
-    books = list_dirs(vokabel_folder)
+def buch_ansicht(book):
+    """Kapitel-, Abschnitts- und Programmauswahl für ein Buch."""
+    chapters = vokabel_db.list_chapters(db, book)
+    if not chapters:
+        st.warning("Keine Kapitel")
+        return
+
+    chapter = st.selectbox(
+        "Kapitel",
+        chapters,
+        key=f"chapter_{book}_{hash(tuple(chapters))}"
+    )
 
-    if not books:
-        st.warning("Keine Bücher gefunden")
-        st.stop()
+    files = vokabel_db.list_sections(db, book, chapter)
 
-    book_tabs = st.tabs(books)
+    if len(files) < 2:
+        st.warning("Mindestens zwei JSON-Dateien")
+        return
 
-    for book, tab in zip(books, book_tabs):
-        with tab:
-            chapters = list_dirs(os.path.join(vokabel_folder, book))
-            if not chapters:
-                st.warning("Keine Kapitel")
-                continue
+    f1 = st.selectbox(
+        "Datei 1",
+        files,
+        key=f"f1_{book}_{chapter}_{hash(tuple(files))}"
+    )
+    f2 = st.selectbox(
+        "Datei 2",
+        files,
+        key=f"f2_{book}_{chapter}_{hash(tuple(files))}"
+    )
 
-            chapter = st.selectbox(
-                "Kapitel",
-                chapters,
-                key=f"chapter_{book}_{hash(tuple(chapters))}"
-            )
+    vocab_file = st.selectbox(
+        "Wörterbuch",
+        vocab_files,
+        key=f"vocab_{book}_{chapter}"
+    )
 
-            chapter_path = os.path.join(vokabel_folder, book, chapter)
-            files = list_json_files(chapter_path)
+    # Kapitel-Abschnitte laden
+    data = vokabel_db.load_sections(db, book, chapter, [f1, f2])
 
-            if len(files) < 2:
-                st.warning("Mindestens zwei JSON-Dateien")
-                continue
+    # Suche im Wörterbuch
+    woerterbuch_suche("selected_vocab_words", f"vocab_{book}_{chapter}", vocab_file)
 
-            f1 = st.selectbox(
-                "Datei 1",
-                files,
-                key=f"f1_{book}_{chapter}_{hash(tuple(files))}"
-            )
-            f2 = st.selectbox(
-                "Datei 2",
-                files,
-                key=f"f2_{book}_{chapter}_{hash(tuple(files))}"
-            )
+    # Alle Wörter zusammenführen: Kapitel + gezielt ausgewählte Wörter aus Vokabeln
+    merged_data = data + st.session_state.selected_vocab_words
+    merged_data = [item for item in merged_data if 'word' in item and 'translation' in item]
+    unique_data = list({item['word']: item for item in merged_data}.values())
 
-            vocab_file = st.selectbox(
-                "Wörterbuch",
-                vocab_files,
-                key=f"vocab_{book}_{chapter}"
-            )
+    # Multiselect für Wörter
+    selected_words = st.multiselect(
+        "Wörter auswählen",
+        [item["word"] for item in unique_data],
+        default=[item["word"] for item in unique_data],
+        key=f"words_{book}_{chapter}_{len(unique_data)}"
+    )
 
-            # Kapitel-Dateien laden
-            data1 = load_json(os.path.join(chapter_path, f1))
-            data2 = load_json(os.path.join(chapter_path, f2))
-            data = data1 + data2
+    # Wort-Translation-Paare
+    words_dict = {item["word"]: item["translation"] for item in unique_data}
+    word_pairs = [(word, words_dict[word]) for word in selected_words]
 
-            # Wörterbuch laden
-            vocab_data = load_json(os.path.join(vocab_folder, vocab_file))
+    # Programm auswählen
+    program = st.selectbox(
+        "Programm",
+        VOKABEL_PROGRAMME,
+        key=f"prog_{book}_{chapter}_{len(selected_words)}"
+    )
 
-            # Initialisiere session_state für ausgewählte Vokabeln, falls nicht vorhanden
-            if "selected_vocab_words" not in st.session_state:
-                st.session_state.selected_vocab_words = []
+    seed_optionen = seed_auswahl(program, f"{book}_{chapter}")
+    optionen = suchgitter_optionen(program, f"{book}_{chapter}")
+    anzahl_varianten, varianten_ausgabe = (
+        varianten_auswahl(f"{book}_{chapter}") if seed_optionen else (1, None)
+    )
 
-            # Suche im Wörterbuch
-            search_term = st.text_input(
-                "Suche Wörter im Wörterbuch",
-                key=f"search_vocab_{book}_{chapter}"
-            )
+    # AB erstellen
+    if st.button("AB erstellen", key=f"run_{book}_{chapter}_{program}"):
+        if not selected_words:
+            st.warning("Bitte zuerst Wörter auswählen!")
+        elif anzahl_varianten > 1:
+            with suchgitter_fehler():
+                varianten_download(
+                    program, anzahl_varianten, varianten_ausgabe, seed_optionen["seed"],
+                    word_pairs, template_path, **optionen
+                )
+        else:
+            with suchgitter_fehler():
+                file = ergebnis_cache.erstelle(
+                    program, word_pairs, template_path, **seed_optionen, **optionen
+                )
 
-            if st.button("Hinzufügen", key=f"add_vocab_{book}_{chapter}"):
-                if search_term:
-                    filtered = [item for item in vocab_data if search_term.lower() in item['word'].lower()]
-                    st.session_state.selected_vocab_words.extend(filtered)
-                    # Dubletten entfernen
-                    st.session_state.selected_vocab_words = list({
-                        item['word']: item for item in st.session_state.selected_vocab_words
-                    }.values())
-
-            # Alle Wörter zusammenführen: Kapitel + gezielt ausgewählte Wörter aus Vokabeln
-            merged_data = data + st.session_state.selected_vocab_words
-            merged_data = [item for item in merged_data if 'word' in item and 'translation' in item]
-            unique_data = list({item['word']: item for item in merged_data}.values())
-
-            # Multiselect für Wörter
-            selected_words = st.multiselect(
-                "Wörter auswählen",
-                [item["word"] for item in unique_data],
-                default=[item["word"] for item in unique_data],
-                key=f"words_{book}_{chapter}_{len(unique_data)}"
-            )
+                st.download_button(
+                    "⬇️ Word herunterladen",
+                    file,
+                    f"{program}.docx",
+                    mime="application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+                )
+
+    with st.expander("⚡ Mehrere Programme auf einmal"):
+        alle_programme(word_pairs, f"{book}_{chapter}")
+
+with tab_vokabeln:
+    st.info("💡 Hinweis: Wenn die Suche verwendet und ABs erstellt wurden, muss die Seite neu geladen werden, bevor zu anderen Vokabeln ABs erstellt werden können.")
+    books = vokabel_db.list_books(db)
+
+    if not books:
+        st.warning("Keine Bücher gefunden")
+        st.stop()
+
+    # Alle Programme für alle Kapitel auf einmal (parallel, als ZIP)
+    with st.expander("📦 Ganze Bücher exportieren"):
+        export_books = st.multiselect("Bücher", books, default=books, key="export_books")
+        export_programme = st.multiselect(
+            "Programme", VOKABEL_PROGRAMME, default=VOKABEL_PROGRAMME, key="export_programme"
+        )
 
-            # Wort-Translation-Paare
-            words_dict = {item["word"]: item["translation"] for item in unique_data}
-            word_pairs = [(word, words_dict[word]) for word in selected_words]
+        if st.button("ZIP erstellen", key="export_zip") and export_books and export_programme:
+            from Programme import export
 
-            # Programm auswählen
-            program = st.selectbox(
-                "Programm",
-                ["Vokabelsuchgitter", "Vokabelrätsel", "Wortschlange", "Zuordnen", "Vokabelliste"],
-                key=f"prog_{book}_{chapter}_{len(selected_words)}"
+            auftraege = export.buch_auftraege(db, export_books, export_programme)
+            fortschritt = st.progress(0.0, text="Starte …")
+            zip_file, fehler = export.exportiere_zip(
+                auftraege,
+                template_path,
+                fortschritt=lambda fertig, gesamt, name: fortschritt.progress(
+                    fertig / gesamt, text=f"{fertig}/{gesamt}: {name}"
+                )
             )
+            fortschritt.empty()
 
-            # AB erstellen
-            if st.button("AB erstellen", key=f"run_{book}_{chapter}_{program}"):
-                if not selected_words:
-                    st.warning("Bitte zuerst Wörter auswählen!")
-                else:
-                    if program == "Wortschlange":
-                        file = run_Wortschlange(word_pairs, template_path)
-                    elif program == "Vokabelrätsel":
-                        file = run_Rätsel(word_pairs, template_path)
-                    elif program == "Vokabelsuchgitter":
-                        file = run_Vokabelsuchgitter(word_pairs, template_path)
-                    elif program == "Zuordnen":
-                        file = Worte_zuordnen(word_pairs, template_path)
-                    else:
-                        file = Vokabellisten(word_pairs, template_path)
+            if fehler:
+                st.warning(
+                    f"{len(fehler)} von {len(auftraege)} Arbeitsblättern fehlgeschlagen "
+                    f"(Details in {export.FEHLER_DATEI}):\n\n"
+                    + "\n".join(f"- {name}: {meldung}" for name, meldung in sorted(fehler.items()))
+                )
+            st.download_button(
+                "⬇️ ZIP herunterladen",
+                zip_file,
+                "Arbeitsblaetter.zip",
+                mime="application/zip"
+            )
 
-                    st.download_button(
-                        "⬇️ Word herunterladen",
-                        file,
-                        f"{program}.docx",
-                        mime="application/vnd.openxmlformats-officedocument.wordprocessingml.document"
-                    )
+    # Nur das gewählte Buch wird geladen und aufgebaut
+    # (st.tabs würde den Inhalt jedes Buch-Tabs bei jedem Rerun ausführen)
+    book = st.radio("Buch", books, horizontal=True, key="vokabeln_book")
+    buch_ansicht(book)
 
 # ========================
 # 4️⃣ Kontexte
@@ -298,7 +647,7 @@ with tab_kontexte:
     st.info("💡 Hinweis: Wenn die Suche verwendet und ABs erstellt wurden, muss die Seite neu geladen werden, bevor zu anderen Vokabeln ABs erstellt werden können.")
     st.header("Kontexte")
 
-    kontext_files = [f for f in os.listdir(kontext_folder) if f.endswith(".json")]
+    kontext_files = vokabel_db.list_contexts(db)
     if not kontext_files:
         st.warning("Keine Kontext-Dateien gefunden!")
     else:
@@ -306,34 +655,11 @@ with tab_kontexte:
             "Wähle einen Kontext aus", kontext_files, key="selected_kontext"
         )
 
-        kontext_data = load_json(os.path.join(kontext_folder, selected_kontext_file))
-
-        # Initialisiere session_state für die ausgewählten Wörter pro Kontext-Datei
-        key_selected = f"selected_kontext_words_{selected_kontext_file}"
-        if key_selected not in st.session_state:
-            st.session_state[key_selected] = []
+        kontext_data = vokabel_db.load_context(db, selected_kontext_file)
 
         # 🔍 Suche im globalen Wörterbuch
-        search_term = st.text_input(
-            "Suche Wörter im Wörterbuch", key=f"search_kontext_{selected_kontext_file}"
-        )
-
-        if st.button("Hinzufügen", key=f"add_kontext_{selected_kontext_file}"):
-            if search_term:
-                vocab_all_path = os.path.join(vocab_folder, "Wörterbuch.json")
-                vocab_all_data = load_json(vocab_all_path)
-
-                filtered = [
-                    item for item in vocab_all_data
-                    if search_term.lower() in item["word"].lower()
-                ]
-
-                st.session_state[key_selected].extend(filtered)
-
-                # Dubletten entfernen
-                st.session_state[key_selected] = list({
-                    item["word"]: item for item in st.session_state[key_selected]
-                }.values())
+        key_selected = f"selected_kontext_words_{selected_kontext_file}"
+        woerterbuch_suche(key_selected, f"kontext_{selected_kontext_file}")
 
         # Kontext + ausgewählte Wörter zusammenführen
         merged_data = kontext_data + st.session_state[key_selected]
@@ -353,35 +679,34 @@ with tab_kontexte:
         words_with_translations = [(word, words_dict[word]) for word in selected_words]
 
         # Programm auswählen
-        programs = ["Vokabelsuchgitter", "Vokabelrätsel", "Wortschlange", "Zuordnen", "Vokabelliste"]
         selected_program = st.selectbox(
             "Programm auswählen",
-            programs,
+            VOKABEL_PROGRAMME,
             key=f"program_kontext_{selected_kontext_file}"
         )
+        seed_optionen = seed_auswahl(selected_program, f"kontext_{selected_kontext_file}")
+        optionen = suchgitter_optionen(selected_program, f"kontext_{selected_kontext_file}")
 
         if st.button("AB erstellen", key=f"run_kontext_{selected_kontext_file}_{selected_program}"):
             if not selected_words:
                 st.warning("Bitte zuerst Wörter auswählen!")
             else:
-                if selected_program == "Wortschlange":
-                    word_file = run_Wortschlange(words_with_translations, template_path)
-                elif selected_program == "Vokabelrätsel":
-                    word_file = run_Rätsel(words_with_translations, template_path)
-                elif selected_program == "Vokabelsuchgitter":
-                    word_file = run_Vokabelsuchgitter(words_with_translations, template_path)
-                elif selected_program == "Vokabelliste":
-                    word_file = Vokabellisten(words_with_translations, template_path)
-                elif selected_program == "Zuordnen":
-                    word_file = Worte_zuordnen(words_with_translations, template_path)
+                with suchgitter_fehler():
+                    word_file = ergebnis_cache.erstelle(
+                        selected_program, words_with_translations, template_path,
+                        **seed_optionen, **optionen
+                    )
 
-                st.download_button(
-                    "Word-Datei herunterladen",
-                    word_file,
-                    f"{selected_program}.docx",
-                    mime="application/vnd.openxmlformats-officedocument.wordprocessingml.document",
-                    key=f"download_kontext_{selected_kontext_file}"
-                )
+                    st.download_button(
+                        "Word-Datei herunterladen",
+                        word_file,
+                        f"{selected_program}.docx",
+                        mime="application/vnd.openxmlformats-officedocument.wordprocessingml.document",
+                        key=f"download_kontext_{selected_kontext_file}"
+                    )
+
+        with st.expander("⚡ Mehrere Programme auf einmal"):
+            alle_programme(words_with_translations, f"kontext_{selected_kontext_file}")
 
 # ========================
 # 5️⃣ Kontexte & Lernstand
@@ -390,12 +715,6 @@ with tab_kontexte:
 with tab_kl:
     st.header("Kontexte & Lernstand")
 
-    # --------------------------------------------------
-    # Session State initialisieren
-    # --------------------------------------------------
-    if "kl_search_results" not in st.session_state:
-        st.session_state.kl_search_results = []
-
     # --------------------------------------------------
     # Kontext auswählen
     # --------------------------------------------------
@@ -405,75 +724,39 @@ with tab_kl:
         key="kl_selected_kontext_file"
     )
 
-    kontext_path = os.path.join(kontext_folder, selected_kontext_file)
-    kontext_data = load_json(kontext_path)  # ✅ LISTE von dicts
+    kontext_levels = get_kontext_mit_lernstand(selected_kontext_file)  # ✅ (Lernstand, dict)
 
     # --------------------------------------------------
     # Lernstand auswählen
     # --------------------------------------------------
+    levels, _ = get_lernstaende()
+    max_level = max(levels, default=1)
+
     num = st.slider(
         "Wähle die Anzahl der Lernstände",
         min_value=1,
-        max_value=81,
+        max_value=max_level,
         value=1,
         step=1,
         key="kl_lernstand_slider"
     )
 
-    # --------------------------------------------------
-    # Lernstände laden
-    # --------------------------------------------------
-    lernstand_data = []
-    for i in range(1, num + 1):
-        try:
-            file_path = os.path.join(kontext_folder, "Vokabeln", f"{i}.json")
-            lernstand_data.extend(load_json(file_path))
-        except FileNotFoundError:
-            st.warning(f"Lernstand {i} nicht gefunden.")
+    fehlende = sorted(set(range(1, num + 1)) - set(levels))
+    if fehlende:
+        st.warning(f"Lernstand nicht gefunden: {', '.join(map(str, fehlende))}")
 
     # --------------------------------------------------
     # 🔹 Kontext-Vokabeln filtern (nur im Lernstand)
     # --------------------------------------------------
-    lernstand_words = {
-        item["word"].lower()
-        for item in lernstand_data
-        if "word" in item
-    }
-
     kontext_vocab_gefiltert = [
-        item for item in kontext_data
-        if item.get("word", "").lower() in lernstand_words
+        item for level, item in kontext_levels
+        if level is not None and level <= num
     ]
 
     # --------------------------------------------------
     # 🔹 Suche im Wörterbuch
     # --------------------------------------------------
-    search_term = st.text_input(
-        "Suche Wörter im Wörterbuch",
-        key="kl_search_term"
-    )
-
-    if st.button("Hinzufügen", key="kl_add_vocab_button"):
-        if search_term:
-            vocab_all_path = os.path.join(
-                vocab_folder,
-                "Wörterbuch.json"
-            )
-            vocab_all_data = load_json(vocab_all_path)
-
-            filtered = [
-                item for item in vocab_all_data
-                if search_term.lower() in item["word"].lower()
-            ]
-
-            st.session_state.kl_search_results.extend(filtered)
-
-            # Dubletten entfernen
-            st.session_state.kl_search_results = list({
-                item["word"]: item
-                for item in st.session_state.kl_search_results
-                if "word" in item
-            }.values())
+    woerterbuch_suche("kl_search_results", "kl")
 
     # --------------------------------------------------
     # 🔗 Kontext + Suchergebnisse zusammenführen
@@ -516,19 +799,13 @@ with tab_kl:
     # --------------------------------------------------
     # Programme auswählen
     # --------------------------------------------------
-    programs = [
-        "Vokabelsuchgitter",
-        "Vokabelrätsel",
-        "Wortschlange",
-        "Zuordnen",
-        "Vokabelliste"
-    ]
-
     selected_program = st.selectbox(
         "Programm auswählen",
-        programs,
+        VOKABEL_PROGRAMME,
         key="kl_selected_program"
     )
+    seed_optionen = seed_auswahl(selected_program, "kl")
+    optionen = suchgitter_optionen(selected_program, "kl")
 
     # --------------------------------------------------
     # Arbeitsblatt erstellen
@@ -537,39 +814,25 @@ with tab_kl:
         if not selected_words:
             st.warning("Bitte zuerst Wörter auswählen!")
         else:
-            if selected_program == "Wortschlange":
-                word_file = run_Wortschlange(
-                    words_with_translations,
-                    template_path
-                )
-            elif selected_program == "Vokabelrätsel":
-                word_file = run_Rätsel(
-                    words_with_translations,
-                    template_path
-                )
-            elif selected_program == "Vokabelsuchgitter":
-                word_file = run_Vokabelsuchgitter(
+            with suchgitter_fehler():
+                word_file = ergebnis_cache.erstelle(
+                    selected_program,
                     words_with_translations,
-                    template_path
+                    template_path,
+                    **seed_optionen,
+                    **optionen
                 )
-            elif selected_program == "Vokabelliste":
-                word_file = Vokabellisten(
-                    words_with_translations,
-                    template_path
-                )
-            elif selected_program == "Zuordnen":
-                word_file = Worte_zuordnen(
-                    words_with_translations,
-                    template_path
+
+                st.download_button(
+                    "Word-Datei herunterladen",
+                    word_file,
+                    f"{selected_program}.docx",
+                    mime="application/vnd.openxmlformats-officedocument.wordprocessingml.document",
+                    key="kl_download_word"
                 )
 
-            st.download_button(
-                "Word-Datei herunterladen",
-                word_file,
-                f"{selected_program}.docx",
-                mime="application/vnd.openxmlformats-officedocument.wordprocessingml.document",
-                key="kl_download_word"
-            )
+    with st.expander("⚡ Mehrere Programme auf einmal"):
+        alle_programme(words_with_translations, "kl")
 
     
 
@@ -0,0 +1,70 @@
+"""
+Wörter im Vokabelsuchgitter platzieren: bisher bis zu 200 zufällige
+Versuche pro Wort im festen 20×20-Gitter (Wörter, die nicht passen,
+fallen weg) vs. Backtracking mit automatischer Gittergröße.
+
+    python benchmarks/bench_platzierung.py
+"""
+import os
+import random
+import sys
+import time
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BASE_DIR)
+
+from Programme import vokabel_db
+from Programme.suchgitter import baue_gitter, richtungen
+
+ANZAHL = [10, 30, 60, 100, 300]
+
+
+def zufaellig(woerter, size=20, rng=random):
+    """Die bisherige Platzierung aus create_wordgrid."""
+    grid = [['' for _ in range(size)] for _ in range(size)]
+    platziert = 0
+    for word in woerter:
+        placed = False
+        attempts = 0
+        while not placed and attempts < 200:
+            attempts += 1
+            row = rng.randint(0, size-1)
+            col = rng.randint(0, size-1)
+            direction = rng.choice(['H', 'V'])
+            if direction == 'H' and col + len(word) <= size:
+                if all(grid[row][col+i] in ('', word[i]) for i in range(len(word))):
+                    for i in range(len(word)):
+                        grid[row][col+i] = word[i]
+                    placed = True
+            elif direction == 'V' and row + len(word) <= size:
+                if all(grid[row+i][col] in ('', word[i]) for i in range(len(word))):
+                    for i in range(len(word)):
+                        grid[row+i][col] = word[i]
+                    placed = True
+        platziert += placed
+    return platziert
+
+
+def messen(funktion, *args, **kwargs):
+    t = time.perf_counter()
+    ergebnis = funktion(*args, **kwargs)
+    return ergebnis, (time.perf_counter() - t) * 1000
+
+
+if __name__ == "__main__":
+    eintraege = vokabel_db.load_dictionary(vokabel_db.connect(), "Wörterbuch.json")
+    alle = [e["word"].replace(" ", "").upper() for e in eintraege if "word" in e]
+
+    print(f"{'Wörter':>7} {'zufällig (20×20)':>24} {'Backtracking':>22} {'+ diagonal/rückwärts':>24}")
+    for n in ANZAHL:
+        woerter = random.Random(n).sample(alle, n)
+        platziert, alt = messen(zufaellig, woerter, rng=random.Random(1))
+        (groesse, _, _), neu = messen(baue_gitter, woerter, rng=random.Random(1))
+        (groesse_d, _, _), neu_d = messen(
+            baue_gitter, woerter, richtungen=richtungen(True, True), rng=random.Random(1)
+        )
+        print(
+            f"{n:7d} {alt:7.1f} ms {platziert:3d}/{n:<3d} platziert"
+            f" {neu:7.1f} ms {groesse:3d}×{groesse:<3d}"
+            f" {neu_d:9.1f} ms {groesse_d:3d}×{groesse_d:<3d}"
+        )
@@ -0,0 +1,54 @@
+"""
+Startzeit von app.py: Generatoren sofort importieren vs. Register mit
+Lazy-Loading. Jede Messung läuft in einem frischen Python-Prozess.
+
+    python benchmarks/bench_startup.py
+"""
+import os
+import statistics
+import subprocess
+import sys
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RUNS = 7
+
+EAGER = """
+import Programme.Konjugationstabelle, Programme.Wortschlange, Programme.Vokabelrätsel
+import Programme.Vokabelsuchgitter, Programme.worksheet_generator, Programme.Listen
+import Programme.Worte_verbinden, Programme.Konjugationen_Unterstriche
+"""
+
+LAZY = """
+from Programme import generatoren, vokabel_db, suche, konjugationen
+assert "docx" not in sys.modules, "python-docx wurde beim Start geladen"
+"""
+
+ERSTER_AUFRUF = LAZY + """
+generatoren.lade("Vokabelliste")
+"""
+
+
+def messen(code):
+    script = (
+        "import sys, time\n"
+        f"sys.path.insert(0, {BASE_DIR!r})\n"
+        "t = time.perf_counter()\n"
+        f"{code}\n"
+        "print(time.perf_counter() - t)\n"
+    )
+    zeiten = []
+    for _ in range(RUNS):
+        out = subprocess.run(
+            [sys.executable, "-c", script], capture_output=True, text=True, check=True
+        ).stdout
+        zeiten.append(float(out.strip().splitlines()[-1]))
+    return statistics.median(zeiten) * 1000
+
+
+if __name__ == "__main__":
+    eager = messen(EAGER)
+    lazy = messen(LAZY)
+    erster = messen(ERSTER_AUFRUF)
+    print(f"Alle Generatoren sofort importieren: {eager:7.1f} ms")
+    print(f"Register (Lazy-Loading):             {lazy:7.1f} ms")
+    print(f"Register + erster Generator-Aufruf:  {erster:7.1f} ms")
@@ -0,0 +1,50 @@
+"""
+Vokabelliste mit vielen Zeilen: python-docx ("docx") vs. direkt
+geschriebenes document.xml ("stream"). Jede Messung läuft in einem
+frischen Python-Prozess; gemessen werden Laufzeit und Spitzen-Speicher
+(maxrss, enthält auch den Speicher von lxml).
+
+    python benchmarks/bench_stream.py
+"""
+import os
+import subprocess
+import sys
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+ZEILEN = [1000, 5000, 20000]
+
+SCRIPT = """
+import resource, sys, time
+sys.path.insert(0, {base!r})
+from Programme.Listen import Vokabellisten
+paare = [("le mot %d" % i, "das Wort %d" % i) for i in range({n})]
+vorher = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+t = time.perf_counter()
+Vokabellisten(paare, {template!r}, backend={backend!r})
+dauer = time.perf_counter() - t
+print(dauer, resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - vorher)
+"""
+
+
+def messen(backend, n):
+    script = SCRIPT.format(
+        base=BASE_DIR,
+        n=n,
+        template=os.path.join(BASE_DIR, "Vorlagen", "Vorlage Vokabellisten.docx"),
+        backend=backend,
+    )
+    out = subprocess.run(
+        [sys.executable, "-c", script], capture_output=True, text=True, check=True
+    ).stdout
+    dauer, speicher_kb = out.split()
+    return float(dauer) * 1000, int(speicher_kb) / 1024
+
+
+if __name__ == "__main__":
+    print(f"{'Zeilen':>7} {'docx':>22} {'stream':>22}")
+    for n in ZEILEN:
+        spalten = []
+        for backend in ("docx", "stream"):
+            ms, mb = messen(backend, n)
+            spalten.append(f"{ms:8.0f} ms {mb:7.1f} MB")
+        print(f"{n:7d} {spalten[0]:>22} {spalten[1]:>22}")
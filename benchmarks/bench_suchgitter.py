@@ -0,0 +1,56 @@
+"""
+Buchstabengitter im Vokabelsuchgitter: bisher Zelle für Zelle über
+table.cell(i, j) mit Schrift an jedem Run vs. eine am Stück gebaute
+Tabelle mit gemeinsamer Zeichenformatvorlage.
+
+    python benchmarks/bench_suchgitter.py
+"""
+import os
+import random
+import string
+import sys
+import time
+
+from docx.shared import Pt
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BASE_DIR)
+
+from Programme.tabellen import Zellformat, baue_tabelle, zeichenformat
+from Programme.vorlagen import lade_vorlage
+
+TEMPLATE = os.path.join(BASE_DIR, "Vorlagen", "Vorlage Vokabellisten.docx")
+GROESSEN = [20, 40, 80]
+# Zelle für Zelle wird ab hier zu langsam zum Messen
+MAX_ALT = 40
+
+
+def zellenweise(doc, grid):
+    table_grid = doc.add_table(rows=len(grid), cols=len(grid[0]))
+    table_grid.style = 'Table Grid'
+    for i, row in enumerate(grid):
+        for j, letter in enumerate(row):
+            r = table_grid.cell(i, j).paragraphs[0].add_run(letter)
+            r.font.name = 'Courier New'
+            r.font.size = Pt(12)
+
+
+def am_stueck(doc, grid):
+    buchstabe = zeichenformat(doc, "Suchgitter Buchstabe", schrift='Courier New', groesse=12)
+    baue_tabelle(doc, grid, spalten=len(grid[0]), zellen_format=Zellformat(zeichenformat=buchstabe))
+
+
+def messen(bauen, grid):
+    doc = lade_vorlage(TEMPLATE)
+    t = time.perf_counter()
+    bauen(doc, grid)
+    return (time.perf_counter() - t) * 1000
+
+
+if __name__ == "__main__":
+    print(f"{'Gitter':>7} {'zellenweise':>13} {'am Stück':>10}")
+    for n in GROESSEN:
+        grid = [[random.choice(string.ascii_uppercase) for _ in range(n)] for _ in range(n)]
+        alt = f"{messen(zellenweise, grid):10.1f} ms" if n <= MAX_ALT else f"{'-':>13}"
+        neu = messen(am_stueck, grid)
+        print(f"{n:>3}x{n:<3} {alt} {neu:7.1f} ms")
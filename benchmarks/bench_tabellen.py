@@ -0,0 +1,83 @@
+"""
+Tabelle mit Kopfzeile, zwei Spalten und Zeilenhöhe 1 cm bauen:
+bisher Zeile für Zeile (add_row + set_zeilenhoehe) vs. baue_tabelle().
+
+    python benchmarks/bench_tabellen.py
+"""
+import os
+import statistics
+import sys
+import time
+
+from docx.shared import Pt
+from docx.enum.text import WD_ALIGN_PARAGRAPH
+from docx.oxml import OxmlElement
+from docx.oxml.ns import qn
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BASE_DIR)
+
+from Programme.tabellen import Zellformat, baue_tabelle
+from Programme.vorlagen import lade_vorlage
+
+TEMPLATE = os.path.join(BASE_DIR, "Vorlagen", "Vorlage Vokabellisten.docx")
+ZEILEN = [50, 200, 1000]
+RUNS = 3
+
+
+def set_zeilenhoehe(row, height_cm):
+    tr = row._tr
+    trPr = tr.get_or_add_trPr()
+    trHeight = OxmlElement('w:trHeight')
+    trHeight.set(qn('w:val'), str(int(height_cm * 567)))
+    trHeight.set(qn('w:hRule'), 'atLeast')
+    trPr.append(trHeight)
+
+
+def zeilenweise(doc, paare):
+    tabelle = doc.add_table(rows=1, cols=2)
+    tabelle.style = 'Table Grid'
+    kopfzeile = tabelle.rows[0].cells
+    kopfzeile[0].text = "Wort"
+    kopfzeile[1].text = "Übersetzung"
+    for zelle in kopfzeile:
+        p = zelle.paragraphs[0]
+        p.alignment = WD_ALIGN_PARAGRAPH.CENTER
+        r = p.runs[0]
+        r.bold = True
+        r.font.size = Pt(14)
+    for wort, uebersetzung in paare:
+        zeile = tabelle.add_row().cells
+        zeile[0].text = wort
+        zeile[1].text = uebersetzung
+    for row in tabelle.rows:
+        set_zeilenhoehe(row, 1)
+
+
+def am_stueck(doc, paare):
+    baue_tabelle(
+        doc,
+        paare,
+        kopfzeile=["Wort", "Übersetzung"],
+        zeilenhoehe_cm=1,
+        kopf_format=Zellformat(fett=True, groesse=14, ausrichtung="center")
+    )
+
+
+def messen(bauen, paare):
+    zeiten = []
+    for _ in range(RUNS):
+        doc = lade_vorlage(TEMPLATE)
+        t = time.perf_counter()
+        bauen(doc, paare)
+        zeiten.append(time.perf_counter() - t)
+    return statistics.median(zeiten) * 1000
+
+
+if __name__ == "__main__":
+    print(f"{'Zeilen':>7} {'zeilenweise':>13} {'am Stück':>10} {'Faktor':>7}")
+    for n in ZEILEN:
+        paare = [(f"le mot {i}", f"das Wort {i}") for i in range(n)]
+        alt = messen(zeilenweise, paare)
+        neu = messen(am_stueck, paare)
+        print(f"{n:7d} {alt:10.1f} ms {neu:7.1f} ms {alt / neu:6.1f}x")